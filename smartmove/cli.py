@@ -12,6 +12,7 @@ Usage:
 """
 
 import argparse
+import functools
 import logging
 import os
 import sys
@@ -25,7 +26,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main():
+@functools.lru_cache(maxsize=1)
+def _build_parser():
+    """Build the argument parser once; parse_args keeps no state between calls"""
     parser = argparse.ArgumentParser(
         description="Cross-filesystem file mover with hardlink preservation",
         epilog="Example: smartmove.py '/mnt/ssd/movie' '/mnt/hdd/movie' --dry-run",
@@ -61,8 +64,32 @@ def main():
     parser.add_argument(
         "--no-progress", action="store_true", help="Disable progress display"
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        "--move-threads",
+        dest="move_threads",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Copy files in N parallel threads (2 suits HDDs, more for SSD/network storage; 0 picks automatically)",
+    )
+    parser.add_argument(
+        "--index-cache",
+        action="store_true",
+        help="Reuse a cached hardlink index for links outside the source (validated before use)",
+    )
+    parser.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Rescan the source filesystem and refresh the hardlink index cache",
+    )
     parser.add_argument("--version", action="version", version="SmartMove 0.2.0")
+    return parser
 
+
+def main():
+    parser = _build_parser()
     args = parser.parse_args()
 
     # Set logging levels
@@ -75,6 +102,9 @@ def main():
     else:
         logging.getLogger().setLevel(logging.ERROR)
 
+    if args.move_threads < 0:
+        parser.error("--jobs must be 0 (automatic) or a positive thread count")
+
     if os.geteuid() != 0:
         logger.error("Root privileges required for file ownership preservation")
         sys.exit(1)
@@ -83,11 +113,14 @@ def main():
         mover = FileMover(
             args.source,
             args.dest,
-            args.parents,
-            args.dry_run,
-            args.quiet,
-            args.comprehensive,
+            create_parents=args.parents,
+            dry_run=args.dry_run,
+            quiet=args.quiet,
+            comprehensive_scan=args.comprehensive,
             show_progress=not args.no_progress,
+            move_threads=args.move_threads,
+            index_cache=args.index_cache,
+            rebuild_index=args.rebuild_index,
         )
         success = mover.move()
 
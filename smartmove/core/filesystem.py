@@ -4,20 +4,201 @@ Cross-Filesystem Mover
 Handles cross-filesystem moves with hardlink preservation.
 """
 
+import errno
+import fcntl
 import logging
 import os
+import queue
 import shutil
 import signal
-import subprocess
+import stat
 import sys
+import threading
 import time
-from datetime import datetime
+import weakref
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from itertools import chain
 from pathlib import Path
 
-from smartmove.utils import ProgressReporter
+from smartmove.utils import HardlinkIndex, ProgressReporter
+from smartmove.utils.output import flush_actions, print_action
 
 logger = logging.getLogger(__name__)
 
+# Largest single kernel copy request
+_COPY_CHUNK = 1 << 30
+
+# Reading sources without touching their atime; only allowed for the file
+# owner or with CAP_FOWNER, so opens retry without it on EPERM
+_O_NOATIME = getattr(os, "O_NOATIME", 0)
+
+# Linux ioctl sharing the source extents with the destination (reflink)
+_FICLONE = 0x40049409
+
+# Errors meaning a kernel copy primitive is unsupported for this file pair
+_COPY_FALLBACK_ERRNOS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.EBADF,
+    errno.ENOTTY,
+}
+
+# Errors ignored when copying extended attributes, as shutil.copy2 does
+_XATTR_LIST_SKIP_ERRNOS = {errno.EOPNOTSUPP, errno.ENODATA, errno.EINVAL}
+_XATTR_SET_SKIP_ERRNOS = _XATTR_LIST_SKIP_ERRNOS | {errno.EPERM}
+
+
+def _copy_xattrs(src_fd, dst_fd):
+    """Copy extended attributes between open files, skipping unsupported ones"""
+    try:
+        names = os.listxattr(src_fd)
+    except OSError as e:
+        if e.errno not in _XATTR_LIST_SKIP_ERRNOS:
+            raise
+        return
+    for name in names:
+        try:
+            os.setxattr(dst_fd, name, os.getxattr(src_fd, name))
+        except OSError as e:
+            if e.errno not in _XATTR_SET_SKIP_ERRNOS:
+                raise
+
+
+class _PerThread:
+    """Accumulators created per thread on first use, merged by the caller"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._local = threading.local()
+        self.shards = []
+
+    def get(self):
+        """Return the calling thread's accumulator"""
+        try:
+            return self._local.value
+        except AttributeError:
+            value = self._local.value = self._factory()
+            self.shards.append(value)
+            return value
+
+
+def _default_move_threads():
+    """Thread count for automatic parallel moves; copies mostly wait on I/O"""
+    return min(32, 4 * (os.cpu_count() or 1))
+
+
+# Movers whose temp files are removed on SIGINT/SIGTERM
+_active_movers = weakref.WeakSet()
+_cleanup_handlers_installed = False
+
+
+def _cleanup_handler(signum, frame):
+    """Remove temp files of every live mover, then exit"""
+    logger.info(f"Received signal {signum}, cleaning up...")
+    for mover in list(_active_movers):
+        mover._cleanup_temp_files()
+    sys.exit(1)
+
+
+def _install_cleanup_handlers():
+    """Install the cleanup signal handlers once per process"""
+    global _cleanup_handlers_installed
+    if _cleanup_handlers_installed:
+        return
+    signal.signal(signal.SIGINT, _cleanup_handler)
+    signal.signal(signal.SIGTERM, _cleanup_handler)
+    _cleanup_handlers_installed = True
+
+
+# Result of the single pass over a source directory tree
+_SourceScan = namedtuple(
+    "_SourceScan", ["total_size", "work_items", "directories", "saw_multilink"]
+)
+
+
+class _ScanShard:
+    """One scanning thread's share of a _SourceScan"""
+
+    __slots__ = ("total_size", "work_items", "directories", "saw_multilink")
+
+    def __init__(self):
+        self.total_size = 0
+        self.work_items = []
+        self.directories = []
+        self.saw_multilink = False
+
+
+def _parallel_scandir(root, visit, workers=8, stop=None):
+    """Walk a directory tree with a pool of scandir worker threads
+
+    visit(directory, entry) is called for every entry and returns True for
+    subdirectories to descend into. Errors on the root propagate; unreadable
+    subdirectories are logged and skipped. Setting the optional stop event
+    ends the walk early. Any other error raised by visit stops the walk and
+    is re-raised once the workers have finished.
+    """
+    if stop is None:
+        stop = threading.Event()
+    pending = queue.Queue()
+    errors = []
+
+    def scan_directory(directory):
+        # Scanning through a directory fd makes entry.stat() an fstatat()
+        # relative to it, so only the final path component is resolved
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            with os.scandir(dir_fd) as entries:
+                for entry in entries:
+                    if stop.is_set():
+                        return
+                    if visit(directory, entry):
+                        pending.put(os.path.join(directory, entry.name))
+        finally:
+            os.close(dir_fd)
+
+    def worker():
+        while True:
+            directory = pending.get()
+            try:
+                if directory is None:
+                    return
+                # Once stopped, queued directories are drained unscanned
+                if not stop.is_set():
+                    scan_directory(directory)
+            except OSError as e:
+                logger.warning(f"Skipping unreadable directory {directory}: {e}")
+            except BaseException as e:
+                # Keep draining the queue so pending.join() cannot hang
+                errors.append(e)
+                stop.set()
+            finally:
+                pending.task_done()
+
+    # Errors on the scan root itself are fatal
+    scan_directory(root)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in range(workers):
+            executor.submit(worker)
+        # Subdirectories are queued before their parent is marked done
+        pending.join()
+        for _ in range(workers):
+            pending.put(None)
+
+    if errors:
+        raise errors[0]
+
+
+def _unique_index(pairs):
+    """Build a HardlinkIndex from (inode, path) pairs, dropping repeated paths"""
+    return HardlinkIndex(
+        dict.fromkeys((inode, os.fspath(path)) for inode, path in pairs)
+    )
+
 
 class CrossFilesystemMover:
     """Handles cross-filesystem moves with hardlink preservation"""
@@ -31,6 +212,9 @@ class CrossFilesystemMover:
         dir_manager=None,
         comprehensive_scan=False,
         show_progress=True,
+        move_threads=1,
+        index_cache=False,
+        rebuild_index=False,
     ):
         self.source_path = source_path
         self.dest_path = dest_path
@@ -39,17 +223,46 @@ class CrossFilesystemMover:
         self.dir_manager = dir_manager
         self.comprehensive_scan = comprehensive_scan
         self.show_progress = show_progress
+        self.move_threads = (
+            move_threads if move_threads > 0 else _default_move_threads()
+        )
+        self.index_cache = index_cache or rebuild_index
+        self.rebuild_index = rebuild_index
         self.verbose_mode = logging.getLogger().getEffectiveLevel() <= logging.INFO
+        # Log actions when verbose or progress disabled to avoid output conflicts
+        self._print_enabled = not quiet and (self.verbose_mode or not show_progress)
         self.moved_inodes = set()
         self.inode_link_counts = {}
+        self._source_scan = None
+
+        # Kernel copy paths found unsupported between source and destination
+        # filesystems are skipped for the rest of the run
+        self._use_reflink = True
+        self._use_copy_file_range = True
+        self._use_sendfile = True
+
+        # New files are created with these IDs, making chown a no-op for
+        # sources the current user already owns
+        self._euid = os.geteuid()
+        self._egid = os.getegid()
+        self._setgid_dirs = {}
+
+        # Thread safety for parallel directory moves
+        self._state_lock = threading.Lock()
+        self._inode_locks = defaultdict(threading.Lock)
 
         # Edge case handling: temp file tracking
         self.temp_files = set()
+        self._temp_suffix = f".smartmove_{os.getpid()}"
 
         # Cache both mount points once
         self.source_root = self._find_mount_point(self.source_path)
         self.dest_root = self._find_mount_point(self.dest_path)
         self.hardlink_index = None
+        # Source device is reused by index scans and cache validation; moves
+        # can rename instead of copy when both sides share it
+        self._source_dev = os.stat(self.source_root).st_dev
+        self._same_device = self._source_dev == os.stat(self.dest_root).st_dev
 
         # Register signal handlers for cleanup
         self._register_cleanup_handlers()
@@ -64,19 +277,13 @@ class CrossFilesystemMover:
         )
 
     def _register_cleanup_handlers(self):
-        """Register signal handlers for graceful cleanup"""
-
-        def cleanup_handler(signum, frame):
-            logger.info(f"Received signal {signum}, cleaning up...")
-            self._cleanup_temp_files()
-            sys.exit(1)
-
-        signal.signal(signal.SIGINT, cleanup_handler)
-        signal.signal(signal.SIGTERM, cleanup_handler)
+        """Register mover with the process-wide signal cleanup"""
+        _active_movers.add(self)
+        _install_cleanup_handlers()
 
     def _cleanup_temp_files(self):
         """Clean up any temporary files"""
-        for temp_file in self.temp_files:
+        for temp_file in list(self.temp_files):
             try:
                 if temp_file.exists():
                     temp_file.unlink()
@@ -93,6 +300,10 @@ class CrossFilesystemMover:
         """Remove file from temp tracking"""
         self.temp_files.discard(temp_file)
 
+    def _untrack_temp_files(self, temp_files):
+        """Remove several files from temp tracking in one set operation"""
+        self.temp_files.difference_update(temp_files)
+
     def _validate_permissions(self):
         """Check read/write permissions before operation"""
         if not os.access(self.source_path, os.R_OK):
@@ -109,15 +320,15 @@ class CrossFilesystemMover:
         """Check available disk space using cached destination mount point"""
         if self.source_path.is_file():
             source_size = self.source_path.stat().st_size
-        else:
+        elif self.source_path.is_dir():
             try:
-                source_size = sum(
-                    f.stat().st_size for f in self.source_path.rglob("*") if f.is_file()
-                )
+                source_size = self._scan_source_tree().total_size
             except OSError as e:
                 raise RuntimeError(
                     f"Cannot calculate source size for space validation: {e}"
                 )
+        else:
+            source_size = 0  # Special files carry no data to copy
 
         try:
             dest_free = shutil.disk_usage(self.dest_root).free
@@ -128,12 +339,52 @@ class CrossFilesystemMover:
         except OSError as e:
             raise RuntimeError(f"Cannot check destination space: {e}")
 
+    def _scan_source_tree(self, workers=8):
+        """Walk source_path once, collecting size, work items and directories"""
+        if self._source_scan is not None:
+            return self._source_scan
+
+        root = str(self.source_path)
+        shards = _PerThread(_ScanShard)
+
+        def visit(directory, entry):
+            shard = shards.get()
+            entry_path = os.path.join(directory, entry.name)
+            # Recurse into real directories only; like os.walk, symlinks to
+            # directories are neither followed nor moved
+            if entry.is_dir(follow_symlinks=False):
+                shard.directories.append(entry_path)
+                return True
+            if entry.is_dir():
+                return False
+            try:
+                file_stat = entry.stat()
+            except OSError:
+                return False  # Broken symlink
+            # Symlinked files count at their target size, as the copy follows
+            # them
+            if stat.S_ISREG(file_stat.st_mode):
+                shard.total_size += file_stat.st_size
+            if file_stat.st_nlink > 1:
+                shard.saw_multilink = True
+            shard.work_items.append((entry_path, file_stat))
+            return False
+
+        _parallel_scandir(root, visit, workers)
+
+        self._source_scan = _SourceScan(
+            total_size=sum(shard.total_size for shard in shards.shards),
+            work_items=[item for shard in shards.shards for item in shard.work_items],
+            directories=[root]
+            + [path for shard in shards.shards for path in shard.directories],
+            saw_multilink=any(shard.saw_multilink for shard in shards.shards),
+        )
+        return self._source_scan
+
     def _print_action(self, message):
         """Print action with timestamp unless quiet mode"""
-        # Log actions when verbose or progress disabled to avoid output conflicts
-        if not self.quiet and (self.verbose_mode or not self.show_progress):
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S,%f")[:-3]
-            print(f"{timestamp} - {message}")
+        if self._print_enabled:
+            print_action(message)
 
     def _find_mount_point(self, path):
         """Find mount point for given path, handling non-existent paths"""
@@ -153,7 +404,7 @@ class CrossFilesystemMover:
         return Path(path)
 
     def _build_hardlink_index(self):
-        """Build memory index of hardlinks using find command"""
+        """Build memory index of hardlinks using a parallel directory walk"""
         if self.hardlink_index is not None:
             return
 
@@ -166,63 +417,22 @@ class CrossFilesystemMover:
         self.hardlink_index = {}
 
         try:
-            # Choose command based on comprehensive_scan flag
             if self.comprehensive_scan:
-                # Scan all mounted filesystems (slower but comprehensive)
-                cmd = [
-                    "find",
-                    str(self.source_root),
-                    "-type",
-                    "f",
-                    "-links",
-                    "+1",
-                    "-printf",
-                    "%i %p\n",
-                ]
                 logger.info(
                     "Using comprehensive scan - may take longer but finds hardlinks across all filesystems"
                 )
             else:
-                # Default: scan only source filesystem (faster)
-                cmd = [
-                    "find",
-                    str(self.source_root),
-                    "-xdev",
-                    "-type",
-                    "f",
-                    "-links",
-                    "+1",
-                    "-printf",
-                    "%i %p\n",
-                ]
                 logger.debug(
                     "Using source-filesystem-only scan for optimal performance"
                 )
 
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=300, check=True
-            )
-
-            for line in result.stdout.strip().split("\n"):
-                if not line.strip():
-                    continue
-
-                parts = line.strip().split(" ", 1)
-                if len(parts) == 2:
-                    try:
-                        inode = int(parts[0])
-                        file_path = Path(parts[1])
-
-                        if inode not in self.hardlink_index:
-                            self.hardlink_index[inode] = []
-                        self.hardlink_index[inode].append(file_path)
-                    except (ValueError, OSError):
-                        continue
+            if self.comprehensive_scan:
+                self.hardlink_index = self._build_hardlink_index_parallel()
+            else:
+                self.hardlink_index = self._build_scoped_hardlink_index()
 
             hardlink_groups = len(self.hardlink_index)
-            total_hardlinked_files = sum(
-                len(paths) for paths in self.hardlink_index.values()
-            )
+            total_hardlinked_files = self.hardlink_index.path_count()
             scope_desc = (
                 "across all filesystems"
                 if self.comprehensive_scan
@@ -232,7 +442,7 @@ class CrossFilesystemMover:
                 f"Indexed {hardlink_groups} hardlink groups ({total_hardlinked_files} files) {scope_desc}"
             )
 
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+        except OSError as e:
             scan_type = (
                 "comprehensive" if self.comprehensive_scan else "source-filesystem-only"
             )
@@ -240,10 +450,179 @@ class CrossFilesystemMover:
                 f"Hardlink detection failed ({scan_type} scan) - tool cannot preserve hardlinks: {e}"
             )
 
-    def find_hardlinks(self, file_path):
+    def _build_scoped_hardlink_index(self):
+        """Index hardlinks from the source itself, scanning the mount only if needed"""
+        if self.source_path.is_dir():
+            found = list(self._scan_multilink_files(str(self.source_path)))
+        else:
+            file_stat = self.source_path.lstat()
+            found = []
+            if stat.S_ISREG(file_stat.st_mode) and file_stat.st_nlink > 1:
+                found.append(
+                    (file_stat.st_ino, str(self.source_path), file_stat.st_nlink)
+                )
+
+        # Groups whose every link was seen need no further search
+        seen_links = defaultdict(int)
+        link_counts = {}
+        for inode, _, nlink in found:
+            seen_links[inode] += 1
+            link_counts[inode] = nlink
+        outside = {
+            inode: link_counts[inode]
+            for inode, seen in seen_links.items()
+            if seen < link_counts[inode]
+        }
+        # Source-side links are always kept: a targeted mount walk that sees an
+        # inode through a bind mount can reach its link count without them
+        pairs = [(inode, path) for inode, path, _ in found]
+
+        if not outside:
+            logger.debug("All hardlinks are inside the source, skipping mount scan")
+            return HardlinkIndex(pairs)
+
+        if self.index_cache:
+            return _unique_index(pairs + self._outside_links_from_cache(outside))
+
+        logger.debug(
+            f"{len(outside)} inodes have links outside the source, scanning mount"
+        )
+        # Links outside the source are all on this filesystem, so the targeted
+        # walk stops once each inode's link count is reached
+        mount_index = self._build_hardlink_index_parallel(inodes=outside)
+        pairs.extend(
+            (inode, path) for inode in mount_index for path in mount_index[inode]
+        )
+        return _unique_index(pairs)
+
+    def _outside_links_from_cache(self, outside):
+        """Resolve outside links from the on-disk index, refreshing it when stale"""
+        pairs = []
+        cache_path = self._index_cache_path()
+        if not self.rebuild_index:
+            cached = self._load_index_cache(cache_path)
+            if cached is not None:
+                pairs, outside = self._validate_cached_links(cached, outside)
+                if not outside:
+                    logger.debug(f"Resolved outside hardlinks from {cache_path}")
+                    return pairs
+
+        # Walk the whole mount so the refreshed cache covers every inode
+        logger.debug(f"Scanning mount to refresh hardlink index cache {cache_path}")
+        mount_index = self._build_hardlink_index_parallel()
+        self._save_index_cache(mount_index, cache_path)
+        pairs.extend(
+            (inode, path) for inode in outside for path in mount_index.get(inode, ())
+        )
+        return pairs
+
+    def _validate_cached_links(self, cached, outside):
+        """Split outside inodes into cache-confirmed pairs and remaining inodes"""
+        root_dev = self._source_dev
+        pairs = []
+        remaining = {}
+        for inode, nlink in outside.items():
+            valid = []
+            for path in cached.get(inode, ()):
+                try:
+                    path_stat = os.lstat(path)
+                except OSError:
+                    continue
+                if path_stat.st_ino == inode and path_stat.st_dev == root_dev:
+                    valid.append(path)
+            # Trust the cache only when it accounts for every current link
+            if len(valid) == nlink:
+                pairs.extend((inode, path) for path in valid)
+            else:
+                remaining[inode] = nlink
+        return pairs, remaining
+
+    def _index_cache_path(self):
+        """Return hardlink index cache file for the source filesystem"""
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+        return Path(cache_home, "smartmove", f"hardlinks-{self._source_dev}.idx")
+
+    def _load_index_cache(self, cache_path):
+        """Load cached hardlink index, or None when missing or unreadable"""
+        try:
+            return HardlinkIndex.load(cache_path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring hardlink index cache {cache_path}: {e}")
+            return None
+
+    def _save_index_cache(self, index, cache_path):
+        """Persist hardlink index, warning when the cache cannot be written"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            index.save(cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write hardlink index cache {cache_path}: {e}")
+
+    def _build_hardlink_index_parallel(self, workers=8, inodes=None):
+        """Walk source mount with parallel scandir workers, indexing files with nlink > 1"""
+        found = self._scan_multilink_files(str(self.source_root), inodes, workers)
+        return HardlinkIndex((inode, path) for inode, path, _ in found)
+
+    def _scan_multilink_files(self, root, inodes=None, workers=8):
+        """Collect (inode, path, nlink) of multi-link files under root
+
+        With inodes ({inode: nlink}), only those inodes are collected and the
+        walk stops as soon as every one of their links has been found.
+        """
+        root_dev = self._source_dev
+        found = _PerThread(list)
+        stop = threading.Event()
+        if inodes is not None:
+            remaining = dict(inodes)
+            remaining_lock = threading.Lock()
+            if not remaining:
+                return iter(())
+
+        def visit(directory, entry):
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    # Equivalent of find -xdev unless comprehensive
+                    return (
+                        self.comprehensive_scan
+                        or entry.stat(follow_symlinks=False).st_dev == root_dev
+                    )
+                if not entry.is_file(follow_symlinks=False):
+                    return False
+                entry_stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                return False  # Removed during the scan
+            if entry_stat.st_nlink < 2:
+                return False
+            inode = entry_stat.st_ino
+            if inodes is not None:
+                # Bind mounts or links added mid-walk can show an inode more
+                # often than its link count; extra sightings of a completed
+                # inode are ignored
+                with remaining_lock:
+                    if inode not in remaining:
+                        return False
+                    remaining[inode] -= 1
+                    if remaining[inode] == 0:
+                        del remaining[inode]
+                        if not remaining:
+                            stop.set()
+            found.get().append(
+                (inode, os.path.join(directory, entry.name), entry_stat.st_nlink)
+            )
+            return False
+
+        _parallel_scandir(root, visit, workers, stop)
+        return chain.from_iterable(found.shards)
+
+    def find_hardlinks(self, file_path, file_stat=None):
         """Find all hardlinks for file using memory index"""
         try:
-            file_stat = file_path.stat()
+            if file_stat is None:
+                file_stat = file_path.stat()
 
             # Build index only when hardlinks detected
             if file_stat.st_nlink <= 1:
@@ -266,26 +645,36 @@ class CrossFilesystemMover:
 
     def map_hardlink_destination(self, source_hardlink):
         """Map hardlink destination path, handling cross-scope hardlinks"""
-        try:
+        link = os.fspath(source_hardlink)
+        if link.startswith(os.path.join(os.fspath(self.source_path), "")):
             # Standard case: hardlink within source directory
-            rel_path = source_hardlink.relative_to(self.source_path)
-            return self.dest_path / rel_path
-        except ValueError:
-            # Cross-scope: preserve original directory structure
-            source_relative = source_hardlink.relative_to(self.source_root)
-            return self.dest_root / source_relative
-
-    def create_file(self, source_file, dest_file, final_path=None):
+            return Path(self._dest_for(link))
+        # Cross-scope: preserve original directory structure
+        source_relative = Path(link).relative_to(self.source_root)
+        return self.dest_root / source_relative
+
+    def create_file(
+        self,
+        source_file,
+        dest_file,
+        final_path=None,
+        source_stat=None,
+        skip_ensure=False,
+    ):
         """Create file at destination via copy with retry logic"""
         try:
-            self.dir_manager.ensure_directory(dest_file.parent)
+            if not skip_ensure:
+                self.dir_manager.ensure_directory(dest_file.parent)
 
             if not self.dry_run:
+                if source_stat is None:
+                    source_stat = source_file.stat()
+
                 # Retry logic for permission errors
                 max_retries = 2
                 for attempt in range(max_retries):
                     try:
-                        shutil.copy2(source_file, dest_file)
+                        self._kernel_copy(source_file, dest_file, source_stat)
                         break
                     except PermissionError as e:
                         if attempt < max_retries - 1:
@@ -301,19 +690,6 @@ class CrossFilesystemMover:
                             return False
                         raise
 
-                # Preserve ownership and permissions
-                source_stat = source_file.stat()
-                os.chmod(dest_file, source_stat.st_mode)
-                try:
-                    os.chown(dest_file, source_stat.st_uid, source_stat.st_gid)
-                except PermissionError:
-                    if os.geteuid() != 0:
-                        logger.warning(
-                            f"Could not preserve ownership for {dest_file} - run with sudo for full preservation"
-                        )
-                    else:
-                        logger.warning(f"Could not preserve ownership for {dest_file}")
-
             # Log final path, not temp path
             display_path = final_path if final_path else dest_file
             action = "Would create" if self.dry_run else "✓ Created"
@@ -324,6 +700,124 @@ class CrossFilesystemMover:
             logger.error(f"Copy failed: {source_file} → {dest_file}: {e}")
             return False
 
+    def _kernel_copy(self, source_file, dest_file, source_stat):
+        """Copy file data in kernel space and apply metadata through the open fd"""
+        # Opening a FIFO would block forever; reject special files as
+        # shutil.copy2 does
+        if stat.S_ISFIFO(source_stat.st_mode):
+            raise shutil.SpecialFileError(f"`{source_file}` is a named pipe")
+        if not stat.S_ISREG(source_stat.st_mode):
+            raise shutil.SpecialFileError(f"`{source_file}` is not a regular file")
+        try:
+            src_fd = os.open(source_file, os.O_RDONLY | _O_NOATIME)
+        except PermissionError:
+            if not _O_NOATIME:
+                raise
+            src_fd = os.open(source_file, os.O_RDONLY)
+        try:
+            try:
+                dst_fd = os.open(dest_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                created = True
+            except FileExistsError:
+                dst_fd = os.open(
+                    dest_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+                )
+                created = False
+            try:
+                # Always copy: the scanned size may be stale if the file grew
+                self._copy_data(src_fd, dst_fd)
+                # Ownership first: chown clears setuid/setgid bits and
+                # security.capability, so mode and xattrs are applied after
+                self._preserve_ownership(dst_fd, dest_file, source_stat, created)
+                _copy_xattrs(src_fd, dst_fd)
+                os.fchmod(dst_fd, stat.S_IMODE(source_stat.st_mode))
+                os.utime(dst_fd, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+
+    def _copy_data(self, src_fd, dst_fd):
+        """Copy file contents, failing when fewer bytes arrive than the source had"""
+        expected = os.fstat(src_fd).st_size
+        self._copy_contents(src_fd, dst_fd)
+        copied = os.fstat(dst_fd).st_size
+        if copied < expected:
+            raise OSError(errno.EIO, f"Short copy: {copied} of {expected} bytes")
+
+    def _copy_contents(self, src_fd, dst_fd):
+        """Copy file contents by reflink, copy_file_range, sendfile or read/write"""
+        if self._use_reflink:
+            try:
+                fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+                return
+            except OSError as e:
+                if e.errno not in _COPY_FALLBACK_ERRNOS:
+                    raise
+                logger.debug(f"Reflink unavailable ({e}), using copy_file_range")
+                self._use_reflink = False
+
+        if self._use_copy_file_range:
+            try:
+                # Some filesystems report EOF instead of an error when they
+                # cannot copy, so a first call copying nothing falls through
+                if os.copy_file_range(src_fd, dst_fd, _COPY_CHUNK):
+                    while os.copy_file_range(src_fd, dst_fd, _COPY_CHUNK):
+                        pass
+                    return
+            except OSError as e:
+                if e.errno not in _COPY_FALLBACK_ERRNOS:
+                    raise
+                logger.debug(f"copy_file_range unavailable ({e}), using sendfile")
+                self._use_copy_file_range = False
+
+        if self._use_sendfile:
+            try:
+                if os.sendfile(dst_fd, src_fd, None, _COPY_CHUNK):
+                    while os.sendfile(dst_fd, src_fd, None, _COPY_CHUNK):
+                        pass
+                    return
+            except OSError as e:
+                if e.errno not in _COPY_FALLBACK_ERRNOS:
+                    raise
+                logger.debug(f"sendfile unavailable ({e}), using read/write")
+                self._use_sendfile = False
+
+        # Both calls advance the file offsets, so this resumes where they stopped
+        with open(src_fd, "rb", closefd=False) as fsrc:
+            with open(dst_fd, "wb", closefd=False) as fdst:
+                shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+
+    def _preserve_ownership(self, dst_fd, dest_file, source_stat, created=True):
+        """Apply source ownership to destination, warning when not permitted"""
+        # Only a newly created inode is known to carry the process IDs; a
+        # truncated existing file keeps its previous owner
+        if (
+            created
+            and source_stat.st_uid == self._euid
+            and source_stat.st_gid == self._egid
+            and not self._is_setgid_dir(dest_file.parent)
+        ):
+            return
+
+        try:
+            os.fchown(dst_fd, source_stat.st_uid, source_stat.st_gid)
+        except PermissionError:
+            if os.geteuid() != 0:
+                logger.warning(
+                    f"Could not preserve ownership for {dest_file} - run with sudo for full preservation"
+                )
+            else:
+                logger.warning(f"Could not preserve ownership for {dest_file}")
+
+    def _is_setgid_dir(self, directory):
+        """Check (cached per directory) whether new files inherit the directory group"""
+        setgid = self._setgid_dirs.get(directory)
+        if setgid is None:
+            setgid = bool(os.stat(directory).st_mode & stat.S_ISGID)
+            self._setgid_dirs[directory] = setgid
+        return setgid
+
     def create_hardlink(
         self, primary_dest_file, dest_hardlink, source_file, final_path=None
     ):
@@ -374,41 +868,55 @@ class CrossFilesystemMover:
             logger.error(f"Hardlink creation failed: {dest_hardlink}: {e}")
             return False
 
-    def move_hardlink_group(self, source_file, dest_file):
+    def move_hardlink_group(
+        self, source_file, dest_file, file_stat=None, skip_ensure=False
+    ):
         """Move file and recreate hardlinks atomically with temp file tracking"""
-        file_stat = source_file.stat()
+        if file_stat is None:
+            file_stat = source_file.stat()
 
-        if file_stat.st_ino in self.moved_inodes:
-            logger.debug(f"Skipping already processed inode {file_stat.st_ino}")
-            return True
-
-        self.inode_link_counts[file_stat.st_ino] = file_stat.st_nlink
+        with self._state_lock:
+            if file_stat.st_ino in self.moved_inodes:
+                logger.debug(f"Skipping already processed inode {file_stat.st_ino}")
+                return True
+            self.inode_link_counts[file_stat.st_ino] = file_stat.st_nlink
 
         message = "Processing" if not self.dry_run else "Would process"
         logger.debug(f"{message}: {source_file}")
-        hardlinks = self.find_hardlinks(source_file)
+        hardlinks = self.find_hardlinks(source_file, file_stat)
 
         if len(hardlinks) > 1:
+            if (
+                self._same_device
+                and not self.dry_run
+                and self._rename_group(hardlinks, source_file, dest_file, skip_ensure)
+            ):
+                with self._state_lock:
+                    self.moved_inodes.add(file_stat.st_ino)
+                return True
+
             # Create all files with temp names first
-            temp_suffix = f".smartmove_{os.getpid()}"
             temp_files = []
 
             try:
                 # Create primary file
-                temp_dest = dest_file.with_suffix(dest_file.suffix + temp_suffix)
+                temp_dest = Path(os.fspath(dest_file) + self._temp_suffix)
                 if not self.dry_run:
                     self._track_temp_file(temp_dest)
 
-                if not self.create_file(source_file, temp_dest, dest_file):
+                if not self.create_file(
+                    source_file, temp_dest, dest_file, file_stat, skip_ensure
+                ):
                     return False
                 temp_files.append((temp_dest, dest_file))
 
                 # Create hardlinks for other instances
+                source_str = os.fspath(source_file)
                 for hardlink in hardlinks:
-                    if hardlink != source_file:
+                    if os.fspath(hardlink) != source_str:
                         dest_hardlink = self.map_hardlink_destination(hardlink)
-                        temp_hardlink = dest_hardlink.with_suffix(
-                            dest_hardlink.suffix + temp_suffix
+                        temp_hardlink = Path(
+                            os.fspath(dest_hardlink) + self._temp_suffix
                         )
 
                         if not self.dry_run:
@@ -426,20 +934,21 @@ class CrossFilesystemMover:
                 # Atomic rename all files
                 if not self.dry_run:
                     for temp_file, final_file in temp_files:
-                        temp_file.rename(final_file)
-                        self._untrack_temp_file(temp_file)
+                        os.replace(temp_file, final_file)
+                    self._untrack_temp_files(temp for temp, _ in temp_files)
 
                 # Remove sources after successful destination creation
                 for link in hardlinks:
                     if not self.dry_run:
-                        link.unlink()
+                        os.unlink(link)
                     self._print_action(
                         f"Would remove: {link}"
                         if self.dry_run
                         else f"✓ Removed: {link}"
                     )
 
-                self.moved_inodes.add(file_stat.st_ino)
+                with self._state_lock:
+                    self.moved_inodes.add(file_stat.st_ino)
                 return True
 
             except Exception as e:
@@ -457,16 +966,74 @@ class CrossFilesystemMover:
 
         else:
             # Single file case
-            if self.create_file(source_file, dest_file):
+            if (
+                self._same_device
+                and not self.dry_run
+                and self._rename_file(source_file, dest_file, skip_ensure)
+            ):
+                with self._state_lock:
+                    self.moved_inodes.add(file_stat.st_ino)
+                return True
+
+            if self.create_file(
+                source_file, dest_file, source_stat=file_stat, skip_ensure=skip_ensure
+            ):
                 if not self.dry_run:
-                    source_file.unlink()
+                    os.unlink(source_file)
                 action = "Would remove" if self.dry_run else "✓ Removed"
                 self._print_action(f"{action}: {source_file}")
-                self.moved_inodes.add(file_stat.st_ino)
+                with self._state_lock:
+                    self.moved_inodes.add(file_stat.st_ino)
                 return True
 
         return False
 
+    def _rename_file(self, source_file, dest_file, skip_ensure=False):
+        """Rename single-link file within one filesystem; return False to copy"""
+        try:
+            if not skip_ensure:
+                self.dir_manager.ensure_directory(dest_file.parent)
+            os.rename(source_file, dest_file)
+        except OSError as e:
+            # EXDEV means a nested mount sits in between
+            if e.errno != errno.EXDEV:
+                logger.debug(f"Rename failed, copying instead: {e}")
+            return False
+        self._print_action(f"✓ Moved: {source_file} → {dest_file}")
+        return True
+
+    def _rename_group(self, hardlinks, source_file, dest_file, skip_ensure=False):
+        """Rename every link of a group within one filesystem; False to copy"""
+        renamed = []
+        try:
+            source_str = os.fspath(source_file)
+            for link in hardlinks:
+                if os.fspath(link) == source_str:
+                    dest_link = dest_file
+                    if not skip_ensure:
+                        self.dir_manager.ensure_directory(dest_link.parent)
+                else:
+                    dest_link = self.map_hardlink_destination(link)
+                    self.dir_manager.ensure_directory(dest_link.parent)
+                os.rename(link, dest_link)
+                renamed.append((link, dest_link))
+        except OSError as e:
+            # EXDEV means a nested mount sits in between; put links back so
+            # the copy path sees the group intact
+            if e.errno != errno.EXDEV:
+                logger.debug(f"Group rename failed, copying instead: {e}")
+            for link, dest_link in reversed(renamed):
+                try:
+                    os.rename(dest_link, link)
+                except OSError as undo_error:
+                    logger.error(f"Cannot restore {link}: {undo_error}")
+                    raise
+            return False
+
+        for link, dest_link in renamed:
+            self._print_action(f"✓ Moved: {link} → {dest_link}")
+        return True
+
     def move_file(self):
         """Move single file with hardlink preservation"""
         return self.move_hardlink_group(self.source_path, self.dest_path)
@@ -478,26 +1045,36 @@ class CrossFilesystemMover:
             f"Moving directory ({scan_mode} scan): {self.source_path} → {self.dest_path}"
         )
 
-        # Setup progress - show unless explicitly disabled or quiet
-        total_files = (
-            self._get_total_file_count() if self.show_progress and not self.quiet else 0
+        # Reuse the pass made for space validation
+        scan = self._scan_source_tree()
+        work_items = scan.work_items
+        if scan.saw_multilink:
+            self._build_hardlink_index()
+        else:
+            logger.debug("No multi-link files in source, skipping hardlink index")
+
+        # Create every destination directory up front so files skip the check;
+        # hardlinks mapped outside the source tree still ensure their own
+        self.dir_manager.ensure_directories(
+            {
+                self._dest_for(parent)
+                for parent in {os.path.dirname(path) for path, _ in work_items}
+            }
         )
+
+        # Setup progress - show unless explicitly disabled or quiet
+        total_files = len(work_items) if self.show_progress and not self.quiet else 0
         show_progress_actual = self.show_progress and not self.verbose_mode
+        # Queued action lines go out before the progress bar takes the line
+        flush_actions()
         progress = ProgressReporter(total_files, self.quiet, show_progress_actual)
 
-        files_processed = 0
-        for root, dirs, files in os.walk(self.source_path):
-            for file_name in files:
-                source_file = Path(root) / file_name
-
-                # Skip if file already processed (removed as part of hardlink group)
-                if not source_file.exists():
-                    continue
-
-                rel_path = source_file.relative_to(self.source_path)
-                dest_file = self.dest_path / rel_path
-
-                if self.move_hardlink_group(source_file, dest_file):
+        if self.move_threads > 1:
+            files_processed = self._move_items_parallel(work_items, progress)
+        else:
+            files_processed = 0
+            for source_file, file_stat in work_items:
+                if self._move_work_item(source_file, file_stat):
                     files_processed += 1
                     progress.update()
 
@@ -518,34 +1095,84 @@ class CrossFilesystemMover:
             logger.info(f"{message}: {files_processed} files processed")
         return True
 
+    def _dest_for(self, source_path):
+        """Map a source path string under source_path to its destination string"""
+        # Scanned paths all start with the source root, so slicing replaces
+        # relative_to() and Path joins in the per-file loop
+        dest_root = os.fspath(self.dest_path)
+        rel = source_path[len(os.fspath(self.source_path)) + 1 :]
+        return os.path.join(dest_root, rel) if rel else dest_root
+
+    def _move_work_item(self, source_file, file_stat):
+        """Move one scanned file, serialized per inode for multi-link files"""
+        if file_stat.st_nlink > 1:
+            with self._state_lock:
+                inode_lock = self._inode_locks[file_stat.st_ino]
+        else:
+            inode_lock = nullcontext()
+
+        with inode_lock:
+            # Skip files already moved as part of a hardlink group; the inode
+            # lock orders this check after the group's own bookkeeping
+            if file_stat.st_nlink > 1 and file_stat.st_ino in self.moved_inodes:
+                return False
+
+            return self.move_hardlink_group(
+                Path(source_file),
+                Path(self._dest_for(source_file)),
+                file_stat,
+                skip_ensure=True,
+            )
+
+    def _move_items_parallel(self, work_items, progress):
+        """Move work items with a thread pool, one task per source directory"""
+        # Files sharing a parent stay in one task so links within a
+        # directory are created sequentially
+        groups = defaultdict(list)
+        for source_file, file_stat in work_items:
+            groups[os.path.dirname(source_file)].append((source_file, file_stat))
+
+        progress_lock = threading.Lock()
+
+        def move_group(items):
+            moved = 0
+            for source_file, file_stat in items:
+                if self._move_work_item(source_file, file_stat):
+                    moved += 1
+                    with progress_lock:
+                        progress.update()
+            return moved
+
+        logger.debug(
+            f"Moving {len(work_items)} files in {len(groups)} directories "
+            f"with {self.move_threads} threads"
+        )
+        files_processed = 0
+        with ThreadPoolExecutor(max_workers=self.move_threads) as executor:
+            futures = [executor.submit(move_group, items) for items in groups.values()]
+            for future in as_completed(futures):
+                files_processed += future.result()
+        return files_processed
+
     def _remove_empty_dirs(self):
         """Remove empty directories bottom-up"""
-        try:
-            for root, dirs, files in os.walk(self.source_path, topdown=False):
-                root_path = Path(root)
-                if root_path.exists() and not any(root_path.iterdir()):
-                    root_path.rmdir()
-                    action = (
-                        "Would remove empty directory"
-                        if self.dry_run
-                        else "✓ Removed empty directory"
-                    )
-                    self._print_action(f"{action}: {root_path}")
-        except OSError as e:
-            logger.debug(f"Directory cleanup issue: {e}")
-
-    def _get_total_file_count(self):
-        """Get total file count for progress reporting"""
-        if self.source_path.is_file():
-            return 1
-        try:
-            result = subprocess.run(
-                ["find", str(self.source_path), "-type", "f", "-print0"],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                check=True,
+        # rmdir fails on non-empty directories, so deepest-first removal of
+        # every scanned directory needs no further listing
+        directories = sorted(
+            self._scan_source_tree().directories,
+            key=lambda path: path.count(os.sep),
+            reverse=True,
+        )
+        for directory in directories:
+            try:
+                os.rmdir(directory)
+            except OSError as e:
+                if e.errno not in (errno.ENOTEMPTY, errno.EEXIST, errno.ENOENT):
+                    logger.debug(f"Directory cleanup issue: {e}")
+                continue
+            action = (
+                "Would remove empty directory"
+                if self.dry_run
+                else "✓ Removed empty directory"
             )
-            return len([f for f in result.stdout.split("\0") if f.strip()])
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
-            return sum(1 for _ in self.source_path.rglob("*") if _.is_file())
+            self._print_action(f"{action}: {directory}")
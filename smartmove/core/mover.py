@@ -6,11 +6,11 @@ Main orchestrator for file moving operations.
 
 import logging
 import shutil
-from datetime import datetime
 from pathlib import Path
 
 from smartmove.core import CrossFilesystemMover
 from smartmove.utils import DirectoryManager
+from smartmove.utils.output import flush_actions, print_action
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +27,9 @@ class FileMover:
         quiet=False,
         comprehensive_scan=False,
         show_progress=True,
+        move_threads=1,
+        index_cache=False,
+        rebuild_index=False,
     ):
         self.source_path = Path(source_path)
         self.dest_path = Path(dest_path)
@@ -44,6 +47,9 @@ class FileMover:
         self.dir_manager = DirectoryManager(dry_run)
         self.comprehensive_scan = comprehensive_scan
         self.show_progress = show_progress
+        self.move_threads = move_threads
+        self.index_cache = index_cache
+        self.rebuild_index = rebuild_index
 
         if not self.source_path.exists():
             raise ValueError(f"Source does not exist: {source_path}")
@@ -57,8 +63,7 @@ class FileMover:
     def _print_action(self, message):
         """Print action with timestamp unless quiet mode"""
         if not self.quiet:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S,%f")[:-3]
-            print(f"{timestamp} - {message}")
+            print_action(message)
 
     def _detect_same_filesystem(self):
         """Check if source and destination are on same filesystem"""
@@ -92,9 +97,16 @@ class FileMover:
 
     def move(self):
         """Execute the move operation"""
+        try:
+            return self._move()
+        finally:
+            # Action lines are batched; write them before returning to caller
+            flush_actions()
+
+    def _move(self):
+        """Run the move, returning success"""
         if self.dry_run:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S,%f")[:-3]
-            print(f"{timestamp} - DRY RUN - Previewing actions only")
+            print_action("DRY RUN - Previewing actions only")
 
         # Create parent directory if needed
         if self.create_parents and not self.dest_path.parent.exists():
@@ -118,6 +130,9 @@ class FileMover:
                 self.dir_manager,
                 self.comprehensive_scan,
                 self.show_progress,
+                self.move_threads,
+                self.index_cache,
+                self.rebuild_index,
             )
 
             if self.source_path.is_file():
@@ -1,4 +1,5 @@
 from .directory import DirectoryManager
+from .hardlink_index import HardlinkIndex
 from .progress import ProgressReporter
 
-__all__ = ["DirectoryManager", "ProgressReporter"]
+__all__ = ["DirectoryManager", "HardlinkIndex", "ProgressReporter"]
@@ -5,6 +5,7 @@ Directory creation and caching to avoid redundant operations.
 """
 
 import os
+import stat
 from pathlib import Path
 
 
@@ -14,21 +15,76 @@ class DirectoryManager:
     def __init__(self, dry_run=False):
         self.dry_run = dry_run
         self.created_dirs = set()
+        self._owner = self._original_owner()
+        self._setgid_dirs = {}  # directory -> setgid bit, for skipping chown
 
     def ensure_directory(self, path):
         """Ensure directory exists with caching to avoid redundant operations"""
         path = Path(path)
-        if path in self.created_dirs or path.exists():
+        if path in self.created_dirs:
             return
 
         if not self.dry_run:
-            path.mkdir(parents=True, exist_ok=True)
-            # Preserve original user ownership for directories
+            # EAFP: one mkdir settles the common cases without a stat probe
             try:
-                original_uid = int(os.environ.get("SUDO_UID", os.getuid()))
-                original_gid = int(os.environ.get("SUDO_GID", os.getgid()))
-                os.chown(path, original_uid, original_gid)
-            except (ValueError, PermissionError):
+                os.mkdir(path)
+            except FileExistsError:
                 pass
+            except FileNotFoundError:
+                path.mkdir(parents=True, exist_ok=True)
+                self._preserve_owner(path)
+            else:
+                self._preserve_owner(path)
 
+        self._cache_with_ancestors(path)
+
+    def _cache_with_ancestors(self, path):
+        """Cache path and its ancestors, which must exist once path does"""
         self.created_dirs.add(path)
+        for parent in path.parents:
+            if parent in self.created_dirs:
+                break
+            self.created_dirs.add(parent)
+
+    @staticmethod
+    def _original_owner():
+        """Return (uid, gid) of the original (pre-sudo) user, or None"""
+        try:
+            return (
+                int(os.environ.get("SUDO_UID", os.getuid())),
+                int(os.environ.get("SUDO_GID", os.getgid())),
+            )
+        except ValueError:
+            return None
+
+    def _preserve_owner(self, path):
+        """Give created directory to the original (pre-sudo) user"""
+        if self._owner is None:
+            return
+        # A new directory inherits the setgid bit and group of its parent
+        setgid = self._is_setgid_dir(path.parent)
+        self._setgid_dirs[path] = setgid
+        # Without sudo or a setgid parent, mkdir already set this owner
+        if not setgid and self._owner == (os.geteuid(), os.getegid()):
+            return
+        try:
+            os.chown(path, *self._owner)
+        except PermissionError:
+            pass
+
+    def _is_setgid_dir(self, directory):
+        """Return whether directory has the setgid bit, caching the answer"""
+        setgid = self._setgid_dirs.get(directory)
+        if setgid is None:
+            try:
+                setgid = bool(os.stat(directory).st_mode & stat.S_ISGID)
+            except OSError:
+                setgid = True  # Unknown; keep the explicit chown
+            self._setgid_dirs[directory] = setgid
+        return setgid
+
+    def ensure_directories(self, paths):
+        """Ensure several directories exist, creating parents before children"""
+        # Parents come first, so a single mkdir usually settles each path
+        for path in sorted(set(map(Path, paths)), key=lambda p: len(p.parts)):
+            self.ensure_directory(path)
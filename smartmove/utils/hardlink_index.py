@@ -0,0 +1,142 @@
+"""
+Hardlink Index for Smart Move
+
+Compact inode-to-paths index stored as parallel arrays instead of Path objects.
+"""
+
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from itertools import islice
+from pathlib import Path
+
+# Cache file header: magic, then inode, group and path offset counts and
+# buffer size
+_CACHE_MAGIC = b"SMVIDX1\n"
+_CACHE_HEADER = struct.Struct("=QQQQ")
+
+
+class HardlinkIndex(Mapping):
+    """Read-only mapping of inode -> [Path, ...] backed by flat arrays"""
+
+    def __init__(self, pairs=()):
+        """Build index from (inode, path) pairs"""
+        entries = sorted(
+            ((inode, os.fsencode(path)) for inode, path in pairs),
+            key=lambda entry: entry[0],
+        )
+
+        self._inodes = array("Q")  # Sorted unique inodes
+        self._groups = array("Q", [0])  # Inode i owns paths groups[i]:groups[i+1]
+        self._offsets = array("Q", [0])  # Path j is buf[offsets[j]:offsets[j+1]]
+        chunks = []
+        size = 0
+        for count, (inode, encoded) in enumerate(entries):
+            if not self._inodes or self._inodes[-1] != inode:
+                if self._inodes:
+                    self._groups.append(count)
+                self._inodes.append(inode)
+            chunks.append(encoded)
+            size += len(encoded)
+            self._offsets.append(size)
+        if self._inodes:
+            self._groups.append(len(entries))
+        self._buf = b"".join(chunks)
+
+    def _position(self, inode):
+        """Return array position of inode or -1"""
+        pos = bisect_left(self._inodes, inode)
+        if pos < len(self._inodes) and self._inodes[pos] == inode:
+            return pos
+        return -1
+
+    def __getitem__(self, inode):
+        pos = self._position(inode) if isinstance(inode, int) else -1
+        if pos < 0:
+            raise KeyError(inode)
+        offsets = self._offsets
+        return [
+            Path(os.fsdecode(self._buf[offsets[j] : offsets[j + 1]]))
+            for j in range(self._groups[pos], self._groups[pos + 1])
+        ]
+
+    def __contains__(self, inode):
+        return isinstance(inode, int) and self._position(inode) >= 0
+
+    def __iter__(self):
+        return iter(self._inodes)
+
+    def __len__(self):
+        return len(self._inodes)
+
+    def path_count(self):
+        """Return total number of indexed paths"""
+        return len(self._offsets) - 1
+
+    def save(self, path):
+        """Write index to path atomically in a compact binary format"""
+        path = Path(path)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}")
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(_CACHE_MAGIC)
+                f.write(
+                    _CACHE_HEADER.pack(
+                        len(self._inodes),
+                        len(self._groups),
+                        len(self._offsets),
+                        len(self._buf),
+                    )
+                )
+                self._inodes.tofile(f)
+                self._groups.tofile(f)
+                self._offsets.tofile(f)
+                f.write(self._buf)
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """Read index written by save(); raises ValueError on malformed files"""
+        index = cls()
+        with open(path, "rb") as f:
+            if f.read(len(_CACHE_MAGIC)) != _CACHE_MAGIC:
+                raise ValueError(f"Not a hardlink index cache: {path}")
+            header = f.read(_CACHE_HEADER.size)
+            if len(header) != _CACHE_HEADER.size:
+                raise ValueError(f"Truncated hardlink index cache: {path}")
+            inodes, groups, offsets, buf_size = _CACHE_HEADER.unpack(header)
+            try:
+                index._inodes = array("Q")
+                index._inodes.fromfile(f, inodes)
+                index._groups = array("Q")
+                index._groups.fromfile(f, groups)
+                index._offsets = array("Q")
+                index._offsets.fromfile(f, offsets)
+            except EOFError:
+                raise ValueError(f"Truncated hardlink index cache: {path}")
+            index._buf = f.read(buf_size)
+            if len(index._buf) != buf_size:
+                raise ValueError(f"Truncated hardlink index cache: {path}")
+        if not index._is_consistent():
+            raise ValueError(f"Corrupt hardlink index cache: {path}")
+        return index
+
+    def _is_consistent(self):
+        """Check arrays describe sorted inodes, in-range groups and offsets"""
+        inodes, groups, offsets = self._inodes, self._groups, self._offsets
+        return (
+            len(groups) == len(inodes) + 1
+            and groups[0] == 0
+            and groups[-1] == len(offsets) - 1
+            and offsets[0] == 0
+            and offsets[-1] == len(self._buf)
+            # Inodes are unique and sorted for bisect; every inode owns a path
+            and all(a < b for a, b in zip(inodes, islice(inodes, 1, None)))
+            and all(a < b for a, b in zip(groups, islice(groups, 1, None)))
+            and all(a <= b for a, b in zip(offsets, islice(offsets, 1, None)))
+        )
@@ -0,0 +1,86 @@
+"""
+Output helpers for Smart Move
+
+Timestamped action lines in the same format as the logging handler.
+"""
+
+import atexit
+import sys
+import threading
+import time
+
+# (second, formatted date and time) of the last call; many actions share a
+# second, so only the milliseconds need formatting
+_second_cache = (None, "")
+
+
+def format_timestamp():
+    """Return current local time as 'YYYY-MM-DD HH:MM:SS,mmm'"""
+    global _second_cache
+    sec, ns = divmod(time.time_ns(), 1_000_000_000)
+    cached_sec, prefix = _second_cache
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+        _second_cache = (sec, prefix)
+    return f"{prefix},{ns // 1_000_000:03d}"
+
+
+class ActionPrinter:
+    """Timestamped action lines written to stdout in batches"""
+
+    def __init__(self, max_lines=256, max_delay=0.1):
+        self.max_lines = max_lines
+        self.max_delay = max_delay
+        self._lines = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._timer = None
+
+    def print(self, message):
+        """Queue action line, writing the batch when full or stale"""
+        line = f"{format_timestamp()} - {message}\n"
+        with self._lock:
+            self._lines.append(line)
+            now = time.monotonic()
+            # An isolated line is written at once; only bursts are batched
+            if (
+                len(self._lines) >= self.max_lines
+                or now - self._last_flush >= self.max_delay
+            ):
+                self._flush(now)
+            elif self._timer is None:
+                # Bound the delay even when no further line arrives, e.g.
+                # while a long copy runs
+                delay = self.max_delay - (now - self._last_flush)
+                self._timer = threading.Timer(delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Write any queued lines"""
+        with self._lock:
+            self._flush(time.monotonic())
+
+    def _flush(self, now):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._lines:
+            sys.stdout.write("".join(self._lines))
+            sys.stdout.flush()
+            self._lines.clear()
+        self._last_flush = now
+
+
+_printer = ActionPrinter()
+atexit.register(_printer.flush)
+
+
+def print_action(message):
+    """Print timestamped action line through the shared batching printer"""
+    _printer.print(message)
+
+
+def flush_actions():
+    """Write pending action lines, e.g. before other output or on exit"""
+    _printer.flush()
@@ -12,6 +12,25 @@ import time
 
 logger = logging.getLogger(__name__)
 
+_BAR_WIDTH = 20
+
+
+def _ascii_bar(filled):
+    """Return ASCII progress bar with an arrow head while in progress"""
+    arrow = ">" if 0 < filled < _BAR_WIDTH else ""
+    return "=" * filled + arrow + " " * (_BAR_WIDTH - filled - len(arrow))
+
+
+# Every possible bar, indexed by filled width
+_UNICODE_BARS = tuple(
+    "█" * filled + "░" * (_BAR_WIDTH - filled) for filled in range(_BAR_WIDTH + 1)
+)
+_ASCII_BARS = tuple(_ascii_bar(filled) for filled in range(_BAR_WIDTH + 1))
+
+# Minimum seconds between redraws and between rate/ETA recalculations
+_REDRAW_INTERVAL = 0.1
+_STATS_INTERVAL = 1.0
+
 
 class ProgressReporter:
     def __init__(self, total_files, quiet=False, show_progress=True):
@@ -22,6 +41,9 @@ class ProgressReporter:
         self.start_time = time.time()
         self.unicode_support = self._detect_unicode()
         self.samples = []
+        self._last_draw = float("-inf")
+        self._last_stats = float("-inf")
+        self._stats = ("", "")
 
     def _detect_unicode(self):
         """Detect Unicode terminal support"""
@@ -72,22 +94,23 @@ class ProgressReporter:
         if not self.show_progress:
             return
 
-        if self.processed_files % 10 == 0 or self.processed_files == self.total_files:
-            pct = int((self.processed_files / self.total_files) * 100)
-
-            # Progress bar
-            bar_width = 20
-            filled = int(bar_width * pct / 100)
+        finished = self.processed_files == self.total_files
+        if self.processed_files % 10 == 0 or finished:
+            now = time.monotonic()
+            if not finished and now - self._last_draw < _REDRAW_INTERVAL:
+                return
+            self._last_draw = now
 
-            if self.unicode_support:
-                bar = "█" * filled + "░" * (bar_width - filled)
-            else:
-                empty = bar_width - filled
-                arrow = ">" if filled < bar_width and filled > 0 else ""
-                spaces = " " * max(0, empty - len(arrow))
-                bar = "=" * filled + arrow + spaces
+            pct = int((self.processed_files / self.total_files) * 100)
+            filled = _BAR_WIDTH * pct // 100
+            bar = (_UNICODE_BARS if self.unicode_support else _ASCII_BARS)[filled]
 
-            rate_str, eta_str = self._calculate_stats()
+            if finished or now - self._last_stats >= _STATS_INTERVAL:
+                self._stats = self._calculate_stats()
+                # Retry on the next redraw until the first second has passed
+                if self._stats != ("", ""):
+                    self._last_stats = now
+            rate_str, eta_str = self._stats
 
             print(
                 f"\r[{bar}] {pct:3d}% {self.processed_files:,}/{self.total_files:,}{rate_str}{eta_str}",
@@ -95,5 +118,5 @@ class ProgressReporter:
                 flush=True,
             )
 
-            if self.processed_files == self.total_files:
+            if finished:
                 print()
@@ -8,496 +8,252 @@ import os
 import shutil
 import sys
 import tempfile
-import unittest
-from pathlib import Path
-from unittest.mock import patch
+from pathlib import Path, PurePath
+from unittest.mock import MagicMock, patch
+
+import pytest
 
 from smartmove import cli
-from smartmove.core import CrossFilesystemMover
+from smartmove.core import CrossFilesystemMover, FileMover
 from smartmove.utils import DirectoryManager
 
+# FileMover is patched in CLI tests, so their paths never touch the disk
+FAKE_SOURCE = PurePath("/fake/src")
+FAKE_DEST = PurePath("/fake/dst")
+BASE_ARGV = ("smartmove.py", str(FAKE_SOURCE), str(FAKE_DEST))
+
+# One specced FileMover stand-in, reset after each test
+_SHARED_MOVER = MagicMock(spec=FileMover)
+
+
+def _temp_base():
+    """Prefer RAM-backed /dev/shm for temp dirs unless TMPDIR is set"""
+    if os.environ.get("TMPDIR") or not sys.platform.startswith("linux"):
+        return None
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return None
+
+
+@pytest.fixture(scope="session")
+def golden_paths():
+    """Real source file and destination path, created once per session"""
+    with tempfile.TemporaryDirectory(dir=_temp_base()) as temp_dir:
+        source_file = Path(temp_dir) / "source.txt"
+        source_file.write_text("test content")
+        yield source_file, Path(temp_dir) / "dest.txt"
+
+
+@pytest.fixture(autouse=True)
+def _reset_root_logger():
+    """Restore the root logger level that cli.main() changes"""
+    root_logger = logging.getLogger()
+    level = root_logger.level
+    yield
+    root_logger.setLevel(level)
+
+
+@pytest.fixture(autouse=True)
+def _root_euid(monkeypatch):
+    """Run every test as root; run_cli(uid=...) overrides for non-root cases"""
+    monkeypatch.setattr(os, "geteuid", lambda: 0)
+
+
+@pytest.fixture
+def mock_mover(monkeypatch):
+    """Install the shared FileMover mock in the CLI module"""
+    monkeypatch.setattr(cli, "FileMover", _SHARED_MOVER)
+    yield _SHARED_MOVER
+    _SHARED_MOVER.reset_mock(side_effect=True)
+
+
+@pytest.fixture
+def run_cli(monkeypatch, mock_mover):
+    """Return a runner for cli.main() with argv, euid and FileMover replaced"""
+
+    def run(*flags, uid=0, move_result=True, side_effect=None):
+        # argparse reads sys.argv as a list
+        monkeypatch.setattr(sys, "argv", list(BASE_ARGV + flags))
+        if uid != 0:
+            monkeypatch.setattr(os, "geteuid", lambda: uid)
+        mock_mover.side_effect = side_effect
+        mock_mover.return_value.move.return_value = move_result
+        cli.main()
+        return mock_mover
+
+    return run
+
+
+@pytest.mark.parametrize(
+    "flags, level",
+    [
+        ((), logging.ERROR),
+        (("--verbose",), logging.INFO),
+        (("-v",), logging.INFO),
+        (("--verbose", "--debug"), logging.DEBUG),
+        (("-v", "--debug"), logging.DEBUG),
+    ],
+)
+def test_main_function_logging_level(run_cli, flags, level):
+    """Test verbosity flags set the root logging level"""
+    mock_mover = run_cli(*flags)
+
+    mock_mover.assert_called_once()
+    assert logging.getLogger().level == level
+
+
+@pytest.mark.parametrize(
+    "flag, kw",
+    [
+        ("--dry-run", "dry_run"),
+        ("--comprehensive", "comprehensive_scan"),
+        ("--parents", "create_parents"),
+        ("--quiet", "quiet"),
+    ],
+)
+def test_main_function_boolean_flags(run_cli, flag, kw):
+    """Test boolean flags reach FileMover as keyword arguments"""
+    assert run_cli().call_args.kwargs[kw] is False
+    assert run_cli(flag).call_args.kwargs[kw] is True
+
+
+def test_main_function_debug_requires_verbose(run_cli):
+    """Test that debug flag requires verbose flag"""
+    with pytest.raises(SystemExit):
+        run_cli("--debug")
+
+
+def test_no_progress_flag_parsing(run_cli):
+    """Test --no-progress flag is parsed correctly"""
+    mock_mover = run_cli("--no-progress")
+
+    assert mock_mover.call_args.kwargs["show_progress"] is False
+
+
+def test_move_threads_flag_parsing(run_cli):
+    """Test --move-threads value is passed to FileMover"""
+    mock_mover = run_cli("--move-threads", "4")
+
+    assert mock_mover.call_args.kwargs["move_threads"] == 4
+
+
+@pytest.mark.parametrize(
+    "flags, expected",
+    [
+        ((), (False, False)),
+        (("--index-cache",), (True, False)),
+        (("--rebuild-index",), (False, True)),
+    ],
+)
+def test_index_cache_flags_parsing(run_cli, flags, expected):
+    """Test --index-cache and --rebuild-index are passed to FileMover"""
+    kwargs = run_cli(*flags).call_args.kwargs
+
+    assert (kwargs["index_cache"], kwargs["rebuild_index"]) == expected
+
+
+@pytest.mark.parametrize("flags", [("-j", "3"), ("--jobs", "3"), ("--jobs", "0")])
+def test_jobs_alias_parsing(run_cli, flags):
+    """Test -j/--jobs set the same thread count as --move-threads"""
+    mock_mover = run_cli(*flags)
+
+    assert mock_mover.call_args.kwargs["move_threads"] == int(flags[1])
+
+
+def test_move_threads_must_not_be_negative(run_cli):
+    """Test --move-threads rejects negative values"""
+    with pytest.raises(SystemExit) as context:
+        run_cli("--move-threads", "-1")
+
+    assert context.value.code == 2
+
+
+@pytest.mark.parametrize(
+    "run_kwargs",
+    [
+        pytest.param({"uid": 1000}, id="non_root_user"),
+        pytest.param({"move_result": False}, id="move_failure"),
+        pytest.param({"side_effect": ValueError("Test error")}, id="exception"),
+        pytest.param(
+            {"uid": 1000, "side_effect": PermissionError("Permission denied")},
+            id="non_root_permission_error",
+        ),
+    ],
+)
+def test_main_function_error_exits(run_cli, run_kwargs):
+    """Test non-root users, failed moves and exceptions exit with status 1"""
+    with pytest.raises(SystemExit) as context:
+        run_cli(**run_kwargs)
+
+    assert context.value.code == 1
+
+
+# Shared by the validation tests, which fail before the manager is used
+MOVER_KW = dict(dry_run=False, quiet=True, dir_manager=DirectoryManager(dry_run=False))
+
+
+def _unreadable_source(source_file, dest_file):
+    """Patch os.access so the source is unreadable"""
+    return patch.object(
+        os,
+        "access",
+        side_effect=lambda path, mode: (
+            mode != os.R_OK if "source" in str(path) else True
+        ),
+    )
+
+
+def _unwritable_dest(source_file, dest_file):
+    """Patch os.access so the destination parent is unwritable"""
+    return patch.object(
+        os,
+        "access",
+        side_effect=lambda path, mode: not (
+            str(path) == str(dest_file.parent) and mode == os.W_OK
+        ),
+    )
+
+
+def _disk_usage_failure(source_file, dest_file):
+    """Patch shutil.disk_usage to fail"""
+    return patch.object(shutil, "disk_usage", side_effect=OSError("Access denied"))
+
+
+@pytest.mark.parametrize(
+    "patcher, expected_exc, expected_msg",
+    [
+        (_unreadable_source, PermissionError, "Cannot read source"),
+        (_unwritable_dest, PermissionError, "Cannot write to destination"),
+        (_disk_usage_failure, RuntimeError, "Cannot check destination space"),
+    ],
+)
+def test_cross_filesystem_validation_errors(
+    golden_paths, patcher, expected_exc, expected_msg
+):
+    """Test CrossFilesystemMover rejects unreadable, unwritable or unsized paths"""
+    source_file, dest_file = golden_paths
+
+    with patcher(source_file, dest_file):
+        with pytest.raises(expected_exc) as context:
+            CrossFilesystemMover(source_file, dest_file, **MOVER_KW)
+
+    assert expected_msg in str(context.value)
+
+
+def test_parser_built_once(run_cli):
+    """Test repeated runs reuse the cached argument parser"""
+    parser = cli._build_parser()
+    run_cli()
+    run_cli("--dry-run")
+
+    assert cli._build_parser() is parser
+
+
+def test_version_flag(monkeypatch):
+    """Test --version flag"""
+    monkeypatch.setattr(sys, "argv", ["smartmove.py", "--version"])
+    with pytest.raises(SystemExit) as context:
+        cli.main()
 
-class TestSmartMoveCLI(unittest.TestCase):
-    """Test CLI argument parsing and main function"""
-
-    def setUp(self):
-        self.temp_dir = Path(tempfile.mkdtemp())
-        self.source_file = self.temp_dir / "source.txt"
-        self.dest_file = self.temp_dir / "dest.txt"
-        self.source_file.write_text("test content")
-
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    def test_main_function_dry_run(self):
-        """Test main function with dry-run flag"""
-
-        test_args = [
-            "smartmove.py",
-            str(self.source_file),
-            str(self.dest_file),
-            "--dry-run",
-        ]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=0):  # Mock root
-                with patch("smartmove.cli.FileMover") as mock_mover:
-                    mock_instance = mock_mover.return_value
-                    mock_instance.move.return_value = True
-
-                    try:
-                        cli.main()
-                    except SystemExit as e:
-                        if e.code != 0:
-                            raise
-
-                    mock_mover.assert_called_once()
-
-    def test_main_function_verbose(self):
-        """Test main function with verbose flag"""
-
-        test_args = [
-            "smartmove.py",
-            str(self.source_file),
-            str(self.dest_file),
-            "--verbose",
-        ]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=0):  # Mock root
-                with patch("smartmove.cli.FileMover") as mock_mover:
-                    mock_instance = mock_mover.return_value
-                    mock_instance.move.return_value = True
-
-                    try:
-                        cli.main()
-                    except SystemExit as e:
-                        if e.code != 0:
-                            raise
-
-                    mock_mover.assert_called_once()
-
-    def test_main_function_verbose_short_flag(self):
-        """Test main function with -v flag (short form for verbose)"""
-
-        test_args = [
-            "smartmove.py",
-            str(self.source_file),
-            str(self.dest_file),
-            "-v",
-        ]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=0):  # Mock root
-                with patch("smartmove.cli.FileMover") as mock_mover:
-                    mock_instance = mock_mover.return_value
-                    mock_instance.move.return_value = True
-
-                    try:
-                        cli.main()
-                    except SystemExit as e:
-                        if e.code != 0:
-                            raise
-
-                    mock_mover.assert_called_once()
-
-    def test_main_function_debug_short_verbose(self):
-        """Test main function with debug flag and -v for verbose"""
-
-        test_args = [
-            "smartmove.py",
-            str(self.source_file),
-            str(self.dest_file),
-            "-v",
-            "--debug",
-        ]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=0):
-                with patch("smartmove.cli.FileMover") as mock_mover:
-                    mock_instance = mock_mover.return_value
-                    mock_instance.move.return_value = True
-
-                    try:
-                        cli.main()
-                    except SystemExit as e:
-                        if e.code != 0:
-                            raise
-
-                    mock_mover.assert_called_once()
-
-    def test_main_function_debug_requires_verbose(self):
-        """Test that debug flag requires verbose flag"""
-
-        test_args = [
-            "smartmove.py",
-            str(self.source_file),
-            str(self.dest_file),
-            "--debug",
-        ]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=0):
-                with self.assertRaises(SystemExit):
-                    cli.main()
-
-    def test_main_function_comprehensive(self):
-        """Test main function with comprehensive flag"""
-
-        test_args = [
-            "smartmove.py",
-            str(self.source_file),
-            str(self.dest_file),
-            "--comprehensive",
-        ]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=0):
-                with patch("smartmove.cli.FileMover") as mock_mover:
-                    mock_instance = mock_mover.return_value
-                    mock_instance.move.return_value = True
-
-                    try:
-                        cli.main()
-                    except SystemExit as e:
-                        if e.code != 0:
-                            raise
-
-                    # Verify comprehensive flag was passed
-                    call_args = mock_mover.call_args
-                    self.assertTrue(call_args[0][5])  # comprehensive_scan parameter
-
-    def test_no_progress_flag_parsing(self):
-        """Test --no-progress flag is parsed correctly"""
-
-        test_args = [
-            "smartmove.py",
-            str(self.source_file),
-            str(self.dest_file),
-            "--no-progress",
-        ]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=0):
-                with patch("smartmove.cli.FileMover") as mock_mover:
-                    mock_instance = mock_mover.return_value
-                    mock_instance.move.return_value = True
-
-                    try:
-                        cli.main()
-                    except SystemExit as e:
-                        if e.code != 0:
-                            raise
-
-                    # Verify show_progress=False was passed
-                    call_args = mock_mover.call_args
-                    self.assertFalse(call_args[1]["show_progress"])
-
-    def test_main_function_parents(self):
-        """Test main function with parents flag"""
-
-        test_args = [
-            "smartmove.py",
-            str(self.source_file),
-            str(self.dest_file),
-            "--parents",
-        ]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=0):
-                with patch("smartmove.cli.FileMover") as mock_mover:
-                    mock_instance = mock_mover.return_value
-                    mock_instance.move.return_value = True
-
-                    try:
-                        cli.main()
-                    except SystemExit as e:
-                        if e.code != 0:
-                            raise
-
-                    # Verify parents flag was passed
-                    call_args = mock_mover.call_args
-                    self.assertTrue(call_args[0][2])  # create_parents parameter
-
-    def test_main_function_quiet(self):
-        """Test main function with quiet flag"""
-
-        test_args = [
-            "smartmove.py",
-            str(self.source_file),
-            str(self.dest_file),
-            "--quiet",
-        ]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=0):
-                with patch("smartmove.cli.FileMover") as mock_mover:
-                    mock_instance = mock_mover.return_value
-                    mock_instance.move.return_value = True
-
-                    try:
-                        cli.main()
-                    except SystemExit as e:
-                        if e.code != 0:
-                            raise
-
-                    # Verify quiet flag was passed
-                    call_args = mock_mover.call_args
-                    self.assertTrue(call_args[0][4])  # quiet parameter
-
-    def test_main_function_non_root_user(self):
-        """Test main function exits for non-root users"""
-
-        test_args = ["smartmove.py", str(self.source_file), str(self.dest_file)]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=1000):  # Non-root
-                with self.assertRaises(SystemExit) as context:
-                    cli.main()
-
-                self.assertEqual(context.exception.code, 1)
-
-    def test_main_function_move_failure(self):
-        """Test main function handles move failure"""
-
-        test_args = ["smartmove.py", str(self.source_file), str(self.dest_file)]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=0):
-                with patch("smartmove.cli.FileMover") as mock_mover:
-                    mock_instance = mock_mover.return_value
-                    mock_instance.move.return_value = False  # Simulate failure
-
-                    with self.assertRaises(SystemExit) as context:
-                        cli.main()
-
-                    self.assertEqual(context.exception.code, 1)
-
-    def test_main_function_exception_handling(self):
-        """Test main function handles exceptions"""
-
-        test_args = ["smartmove.py", str(self.source_file), str(self.dest_file)]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=0):
-                with patch(
-                    "smartmove.cli.FileMover", side_effect=ValueError("Test error")
-                ):
-                    with self.assertRaises(SystemExit) as context:
-                        cli.main()
-
-                    self.assertEqual(context.exception.code, 1)
-
-    def test_logging_level_verbose(self):
-        """Test logging level setting with verbose flag"""
-
-        test_args = [
-            "smartmove.py",
-            str(self.source_file),
-            str(self.dest_file),
-            "--verbose",
-        ]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=0):
-                with patch("smartmove.FileMover") as mock_mover:
-                    mock_instance = mock_mover.return_value
-                    mock_instance.move.return_value = True
-
-                    try:
-                        cli.main()
-                    except SystemExit as e:
-                        if e.code != 0:
-                            raise
-
-                    # Check if logging level was set to INFO
-                    self.assertEqual(logging.getLogger().level, logging.INFO)
-
-    def test_logging_level_verbose_short_flag(self):
-        """Test logging level setting with -v flag"""
-
-        test_args = [
-            "smartmove.py",
-            str(self.source_file),
-            str(self.dest_file),
-            "-v",
-        ]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=0):
-                with patch("smartmove.FileMover") as mock_mover:
-                    mock_instance = mock_mover.return_value
-                    mock_instance.move.return_value = True
-
-                    try:
-                        cli.main()
-                    except SystemExit as e:
-                        if e.code != 0:
-                            raise
-
-                    # Check if logging level was set to INFO
-                    self.assertEqual(logging.getLogger().level, logging.INFO)
-
-    def test_logging_level_debug_short_verbose(self):
-        """Test logging level setting with -v and --debug flags"""
-
-        test_args = [
-            "smartmove.py",
-            str(self.source_file),
-            str(self.dest_file),
-            "-v",
-            "--debug",
-        ]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=0):
-                with patch("smartmove.FileMover") as mock_mover:
-                    mock_instance = mock_mover.return_value
-                    mock_instance.move.return_value = True
-
-                    try:
-                        cli.main()
-                    except SystemExit as e:
-                        if e.code != 0:
-                            raise
-
-                    # Check if logging level was set to DEBUG
-                    self.assertEqual(logging.getLogger().level, logging.DEBUG)
-
-    def test_logging_level_debug(self):
-        """Test logging level setting with debug flag"""
-
-        test_args = [
-            "smartmove.py",
-            str(self.source_file),
-            str(self.dest_file),
-            "--verbose",
-            "--debug",
-        ]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=0):
-                with patch("smartmove.FileMover") as mock_mover:
-                    mock_instance = mock_mover.return_value
-                    mock_instance.move.return_value = True
-
-                    try:
-                        cli.main()
-                    except SystemExit as e:
-                        if e.code != 0:
-                            raise
-
-                    # Check if logging level was set to DEBUG
-                    self.assertEqual(logging.getLogger().level, logging.DEBUG)
-
-    def test_logging_level_default(self):
-        """Test default logging level"""
-
-        test_args = ["smartmove.py", str(self.source_file), str(self.dest_file)]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=0):
-                with patch("smartmove.FileMover") as mock_mover:
-                    mock_instance = mock_mover.return_value
-                    mock_instance.move.return_value = True
-
-                    try:
-                        cli.main()
-                    except SystemExit as e:
-                        if e.code != 0:
-                            raise
-
-                    # Check if logging level was set to ERROR (default)
-                    self.assertEqual(logging.getLogger().level, logging.ERROR)
-
-    def test_cross_filesystem_permission_validation(self):
-        """Test permission validation in CrossFilesystemMover"""
-
-        # Test unreadable source
-        with patch("os.access") as mock_access:
-            mock_access.side_effect = lambda path, mode: (
-                mode != os.R_OK if "source" in str(path) else True
-            )
-
-            with self.assertRaises(PermissionError) as context:
-                CrossFilesystemMover(
-                    self.source_file,
-                    self.dest_file,
-                    dry_run=False,
-                    quiet=True,
-                    dir_manager=DirectoryManager(dry_run=False),
-                )
-
-            self.assertIn("Cannot read source", str(context.exception))
-
-    def test_cross_filesystem_dest_permission_validation(self):
-        """Test destination permission validation"""
-
-        # Test unwritable destination
-        with patch("os.access") as mock_access:
-            # Return False for write access on destination parent
-            def access_side_effect(path, mode):
-                if str(path) == str(self.dest_file.parent) and mode == os.W_OK:
-                    return False
-                return True
-
-            mock_access.side_effect = access_side_effect
-
-            with self.assertRaises(PermissionError) as context:
-                CrossFilesystemMover(
-                    self.source_file,
-                    self.dest_file,
-                    dry_run=False,
-                    quiet=True,
-                    dir_manager=DirectoryManager(dry_run=False),
-                )
-
-            self.assertIn("Cannot write to destination", str(context.exception))
-
-    def test_cross_filesystem_space_validation_error(self):
-        """Test space validation error handling"""
-
-        # Mock shutil.disk_usage to fail
-        with patch("shutil.disk_usage", side_effect=OSError("Access denied")):
-            with self.assertRaises(RuntimeError) as context:
-                CrossFilesystemMover(
-                    self.source_file,
-                    self.dest_file,
-                    dry_run=False,
-                    quiet=True,
-                    dir_manager=DirectoryManager(dry_run=False),
-                )
-
-            self.assertIn("Cannot check destination space", str(context.exception))
-
-    def test_main_function_permission_error_message(self):
-        """Test improved permission error message"""
-
-        test_args = ["smartmove.py", str(self.source_file), str(self.dest_file)]
-
-        with patch.object(sys, "argv", test_args):
-            with patch("os.geteuid", return_value=1000):  # Non-root
-                with patch(
-                    "smartmove.FileMover",
-                    side_effect=PermissionError("Permission denied"),
-                ):
-                    with self.assertRaises(SystemExit) as context:
-                        cli.main()
-
-                    self.assertEqual(context.exception.code, 1)
-
-    def test_version_flag(self):
-        """Test --version flag"""
-
-        test_args = ["smartmove.py", "--version"]
-
-        with patch.object(sys, "argv", test_args):
-            with self.assertRaises(SystemExit) as context:
-                cli.main()
-
-            # argparse exits with code 0 for --version
-            self.assertEqual(context.exception.code, 0)
-
-
-if __name__ == "__main__":
-    unittest.main(verbosity=2)
+    # argparse exits with code 0 for --version
+    assert context.value.code == 0
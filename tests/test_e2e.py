@@ -6,26 +6,224 @@ Tests comprehensive scanning, failure scenarios, and cross-scope hardlink preser
 Requires root privileges for loop device creation and filesystem mounting.
 """
 
+import ctypes
+import errno
+import fcntl
 import os
 import shutil
+import struct
 import subprocess
 import sys
 import tempfile
 import time
 import unittest
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from smartmove.core import CrossFilesystemMover, FileMover
 
+# Loop device ioctls from linux/loop.h
+_LOOP_CTL_GET_FREE = 0x4C82
+_LOOP_CONFIGURE = 0x4C0A  # Linux 5.8+
+_LOOP_CLR_FD = 0x4C01
+_LO_FLAGS_DIRECT_IO = 16
+# struct loop_config: fd, block_size, struct loop_info64, reserved words
+_LOOP_CONFIG = struct.Struct("=II5Q4I64s64s32s2Q8Q")
+
+
+def _configure_loop(image, lo_flags=0):
+    """Attach image to a free loop device with a single LOOP_CONFIGURE ioctl"""
+    image_fd = os.open(image, os.O_RDWR | os.O_CLOEXEC)
+    try:
+        ctl_fd = os.open("/dev/loop-control", os.O_RDWR | os.O_CLOEXEC)
+        try:
+            for _ in range(8):
+                loop_dev = f"/dev/loop{fcntl.ioctl(ctl_fd, _LOOP_CTL_GET_FREE)}"
+                loop_fd = os.open(loop_dev, os.O_RDWR | os.O_CLOEXEC)
+                try:
+                    config = _LOOP_CONFIG.pack(
+                        image_fd,
+                        0,  # Default block size
+                        *(0,) * 5,  # Device, inode, rdevice, offset, sizelimit
+                        *(0,) * 3,  # Number and encryption fields
+                        lo_flags,
+                        os.fsencode(image)[:63],
+                        b"",
+                        b"",
+                        *(0,) * 10,  # lo_init and reserved words
+                    )
+                    fcntl.ioctl(loop_fd, _LOOP_CONFIGURE, config)
+                    return loop_dev
+                except OSError as e:
+                    # Another process claimed the free device first
+                    if e.errno != errno.EBUSY:
+                        raise
+                finally:
+                    os.close(loop_fd)
+        finally:
+            os.close(ctl_fd)
+    finally:
+        os.close(image_fd)
+    raise OSError(errno.EBUSY, "No free loop device")
+
+
+def _attach_loop(image):
+    """Attach image to a loop device, falling back to losetup on older kernels"""
+    # Direct I/O skips the page cache copy of the backing file; backing
+    # filesystems without O_DIRECT support get a buffered device instead
+    for lo_flags in (_LO_FLAGS_DIRECT_IO, 0):
+        try:
+            return _configure_loop(image, lo_flags)
+        except OSError as e:
+            if e.errno not in (errno.ENOTTY, errno.EINVAL, errno.ENOENT):
+                raise
+    for direct_io in ("on", "off"):
+        result = subprocess.run(
+            ["losetup", "--find", "--show", f"--direct-io={direct_io}", str(image)],
+            capture_output=True,
+            text=True,
+            check=direct_io == "off",
+        )
+        if result.returncode == 0:
+            return result.stdout.strip()
+
+
+def _detach_loop(loop_dev):
+    """Detach a loop device with LOOP_CLR_FD instead of forking losetup -d"""
+    loop_fd = os.open(loop_dev, os.O_RDONLY | os.O_CLOEXEC)
+    try:
+        fcntl.ioctl(loop_fd, _LOOP_CLR_FD)
+    finally:
+        os.close(loop_fd)
+
+
+_libc = ctypes.CDLL(None, use_errno=True)
+_MS_NOATIME = 1024  # From linux/mount.h
+
+
+def _mount(device, target):
+    """Mount an E2E filesystem with mount(2) instead of forking mount(8)"""
+    if _libc.mount(
+        os.fsencode(device), os.fsencode(target), b"ext4", _MS_NOATIME, _MOUNT_DATA
+    ):
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err), str(target))
+
+
+def _umount(target):
+    """Unmount with umount2(2) instead of forking umount(8)"""
+    if _libc.umount2(os.fsencode(target), 0):
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err), str(target))
+
+
+# Throwaway test filesystems trade durability for speed: no journal, no
+# write barriers and no atime updates
+_MKFS_OPTIONS = [
+    "-O",
+    "^has_journal,^64bit",
+    "-E",
+    "lazy_itable_init=0,lazy_journal_init=0,nodiscard",
+    "-m",
+    "0",
+]
+# Default image size and the extra options that keep its metadata small;
+# larger images keep the ext4 defaults so they have inodes for bulk tests
+_DEFAULT_SIZE_MB = 8
+_SMALL_MKFS_OPTIONS = ["-N", "1024", "-b", "1024"]
+# "mount1:mount2" of two pre-mounted filesystems to reuse instead of mkfs
+_LOOP_POOL_ENV = "SMARTMOVE_LOOP_POOL"
+# Set to "1" to leave fresh mounts root-owned even under sudo
+_KEEP_ROOT_ENV = "SMARTMOVE_KEEP_ROOT_OWNED"
+# Shared payload for bulk datasets, which only check hardlinks by inode
+_BULK_CONTENT = b"bulk test content"
+_MOUNT_DATA = b"nobarrier"  # Mounted with MS_NOATIME as well
+
+
+def _image_dir():
+    """Return tmpfs directory for filesystem images, or None for the default"""
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return None
+
+
+def _write(path, data):
+    """Write str or bytes to path with raw os calls, skipping the io layer"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data.encode() if isinstance(data, str) else data)
+    finally:
+        os.close(fd)
+
+
+def _count_txt(root):
+    """Count .txt files under root without building Path objects"""
+    count = 0
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".txt"):
+                    count += 1
+    return count
+
+
+def _make_groups(args):
+    """Create a shard of hardlink groups; runs in a worker process"""
+    base_dir, groups, links_per_group, original_fmt, link_fmt = args
+    link_pairs = []
+    for i in groups:
+        original = os.path.join(base_dir, original_fmt.format(i=i))
+        os.mkdir(os.path.dirname(original))
+        _write(original, _BULK_CONTENT)
+        link_pairs.extend(
+            (original, os.path.join(base_dir, link_fmt.format(i=i, j=j)))
+            for j in range(links_per_group)
+        )
+    for source, link in link_pairs:
+        os.link(source, link)
+
+
+def _build_link_dataset(base_dir, num_groups, links_per_group, original_fmt, link_fmt):
+    """Create hardlink groups in parallel; formats take group i and link j"""
+    # Link directories are shared by every group, so create them up front
+    for j in range(links_per_group):
+        os.mkdir(os.path.join(base_dir, os.path.dirname(link_fmt.format(i=0, j=j))))
+
+    workers = os.cpu_count() or 1
+    shards = [
+        (
+            str(base_dir),
+            range(num_groups)[w::workers],
+            links_per_group,
+            original_fmt,
+            link_fmt,
+        )
+        for w in range(workers)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(_make_groups, shards))
+
+
+def _stat_or_none(path):
+    """Return os.stat result for path, or None if it does not exist"""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
 
 class RealFilesystemTestSetup:
     """Setup and teardown real different filesystems for E2E testing"""
 
-    def __init__(self, size_mb=50):
+    def __init__(self, size_mb=_DEFAULT_SIZE_MB):
         self.size_mb = size_mb
         self.temp_dir = None
         self.loop_devices = []
         self.mount_points = []
+        self.pool_dirs = []
 
     def __enter__(self):
         return self.setup()
@@ -38,46 +236,51 @@ class RealFilesystemTestSetup:
         if os.geteuid() != 0:
             raise PermissionError("E2E tests require root privileges for loop devices")
 
-        self.temp_dir = Path(tempfile.mkdtemp(prefix="smartmove_e2e_"))
+        pool = os.environ.get(_LOOP_POOL_ENV)
+        if pool:
+            return self._setup_from_pool(pool)
+
+        # Memory-backed images keep mkfs and test I/O off the host disk
+        self.temp_dir = Path(
+            tempfile.mkdtemp(prefix="smartmove_e2e_", dir=_image_dir())
+        )
 
         try:
             # Create filesystem images
             fs1_img = self.temp_dir / "fs1.img"
             fs2_img = self.temp_dir / "fs2.img"
 
-            # Create sparse images for speed
-            with open(fs1_img, "wb") as f:
-                f.seek(self.size_mb * 1024 * 1024 - 1)
-                f.write(b"\0")
-            with open(fs2_img, "wb") as f:
-                f.seek(self.size_mb * 1024 * 1024 - 1)
-                f.write(b"\0")
+            # Preallocate disk-backed images so mkfs and moves write to
+            # contiguous blocks; tmpfs gains nothing and would pin the RAM
+            preallocate = _image_dir() is None
+            for image in (fs1_img, fs2_img):
+                self._create_image(image, preallocate)
 
             # Setup loop devices
-            loop1_result = subprocess.run(
-                ["losetup", "--find", "--show", str(fs1_img)],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            loop2_result = subprocess.run(
-                ["losetup", "--find", "--show", str(fs2_img)],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-
-            loop1_dev = loop1_result.stdout.strip()
-            loop2_dev = loop2_result.stdout.strip()
-            self.loop_devices = [loop1_dev, loop2_dev]
+            loop1_dev = _attach_loop(fs1_img)
+            self.loop_devices.append(loop1_dev)
+            loop2_dev = _attach_loop(fs2_img)
+            self.loop_devices.append(loop2_dev)
 
             # Create filesystems (suppress output)
-            subprocess.run(
-                ["mkfs.ext4", "-F", "-q", loop1_dev], check=True, capture_output=True
-            )
-            subprocess.run(
-                ["mkfs.ext4", "-F", "-q", loop2_dev], check=True, capture_output=True
-            )
+            mkfs_options = list(_MKFS_OPTIONS)
+            if self.size_mb <= _DEFAULT_SIZE_MB:
+                mkfs_options += _SMALL_MKFS_OPTIONS
+            # Both filesystems are formatted concurrently
+            mkfs_procs = [
+                subprocess.Popen(
+                    ["mkfs.ext4", "-F", "-q", *mkfs_options, loop_dev],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                )
+                for loop_dev in (loop1_dev, loop2_dev)
+            ]
+            mkfs_errors = [proc.communicate()[1] for proc in mkfs_procs]
+            for proc, stderr in zip(mkfs_procs, mkfs_errors):
+                if proc.returncode:
+                    raise subprocess.CalledProcessError(
+                        proc.returncode, proc.args, stderr=stderr
+                    )
 
             # Create mount points
             mount1 = self.temp_dir / "fs1_mount"
@@ -86,17 +289,17 @@ class RealFilesystemTestSetup:
             mount2.mkdir()
 
             # Mount filesystems
-            subprocess.run(["mount", loop1_dev, str(mount1)], check=True)
-            subprocess.run(["mount", loop2_dev, str(mount2)], check=True)
-            self.mount_points = [mount1, mount2]
-
-            # Make writable by original user
-            original_uid = int(os.environ.get("SUDO_UID", os.getuid()))
-            original_gid = int(os.environ.get("SUDO_GID", os.getgid()))
-
-            for mount in self.mount_points:
-                os.chown(mount, original_uid, original_gid)
-                os.chmod(mount, 0o755)
+            for loop_dev, mount in ((loop1_dev, mount1), (loop2_dev, mount2)):
+                _mount(loop_dev, mount)
+                self.mount_points.append(mount)
+
+            # Make writable by the sudo user for debugging; mkfs already
+            # leaves the root directory at 0755, and root needs no chown
+            if "SUDO_UID" in os.environ and os.environ.get(_KEEP_ROOT_ENV) != "1":
+                original_uid = int(os.environ["SUDO_UID"])
+                original_gid = int(os.environ.get("SUDO_GID", os.getgid()))
+                for mount in self.mount_points:
+                    os.chown(mount, original_uid, original_gid)
 
             return mount1, mount2
 
@@ -104,21 +307,56 @@ class RealFilesystemTestSetup:
             self.cleanup()
             raise RuntimeError(f"Failed to setup E2E test filesystems: {e}")
 
+    def _setup_from_pool(self, pool):
+        """Reuse pool filesystems, isolated in fresh per-setup directories"""
+        mounts = [Path(mount) for mount in pool.split(":")]
+        if len(mounts) != 2 or mounts[0].stat().st_dev == mounts[1].stat().st_dev:
+            raise RuntimeError(
+                f"{_LOOP_POOL_ENV} must name two mounts on different filesystems"
+            )
+        # Same name on both mounts, so mount-relative cross-scope paths match
+        pool_dir1 = Path(tempfile.mkdtemp(prefix="smartmove_e2e_", dir=mounts[0]))
+        self.pool_dirs.append(pool_dir1)
+        pool_dir2 = mounts[1] / pool_dir1.name
+        pool_dir2.mkdir(mode=0o700)
+        self.pool_dirs.append(pool_dir2)
+        return pool_dir1, pool_dir2
+
+    def _create_image(self, image, preallocate):
+        """Create image file, preallocated when possible and sparse otherwise"""
+        size = self.size_mb * 1024 * 1024
+        fd = os.open(image, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            if preallocate:
+                try:
+                    os.posix_fallocate(fd, 0, size)
+                    return
+                except OSError:
+                    pass  # Filesystem without fallocate support
+            os.ftruncate(fd, size)
+        finally:
+            os.close(fd)
+
     def cleanup(self):
         """Cleanup loop devices and temporary files"""
         try:
+            # Pool filesystems stay mounted; only this setup's content goes
+            for pool_dir in self.pool_dirs:
+                shutil.rmtree(pool_dir, ignore_errors=True)
+
             # Unmount filesystems
             for mount in self.mount_points:
-                if mount.exists():
-                    subprocess.run(
-                        ["umount", str(mount)], capture_output=True, check=False
-                    )
+                try:
+                    _umount(mount)
+                except OSError:
+                    pass  # Not mounted
 
             # Detach loop devices
             for loop_dev in self.loop_devices:
-                subprocess.run(
-                    ["losetup", "-d", loop_dev], capture_output=True, check=False
-                )
+                try:
+                    _detach_loop(loop_dev)
+                except OSError:
+                    pass  # Already detached
 
             # Remove temp directory
             if self.temp_dir and self.temp_dir.exists():
@@ -139,247 +377,264 @@ class TestComprehensiveE2E(unittest.TestCase):
             raise unittest.SkipTest("E2E tests require root privileges")
 
         # Check required tools
-        required_tools = ["losetup", "mkfs.ext4", "mount", "umount"]
+        required_tools = ["losetup", "mkfs.ext4"]
         for tool in required_tools:
             if subprocess.run(["which", tool], capture_output=True).returncode != 0:
                 raise unittest.SkipTest(f"Required tool not found: {tool}")
 
-    def test_comprehensive_flag_behavior(self):
-        """Test comprehensive vs default scanning behavior"""
-
-        with RealFilesystemTestSetup() as (fs1_mount, fs2_mount):
-            # Create complex structure with cross-filesystem hardlinks
-            source_dir = fs1_mount / "source"
-            source_dir.mkdir()
-
-            # Create file in source
-            source_file = source_dir / "test_file.txt"
-            source_file.write_text("Test content")
-
-            # Create hardlink outside source directory but within same filesystem
-            outside_link = fs1_mount / "outside_source.txt"
-            os.link(source_file, outside_link)
-
-            # Verify hardlink exists
-            self.assertEqual(source_file.stat().st_ino, outside_link.stat().st_ino)
-            self.assertEqual(source_file.stat().st_nlink, 2)
-
-            # Test 1: Default behavior (should not find outside hardlink)
-            dest_dir_default = fs2_mount / "moved_default"
-            mover_default = FileMover(
-                source_dir,
-                dest_dir_default,
-                create_parents=True,
-                dry_run=False,
-                quiet=True,
-                comprehensive_scan=False,
-            )
+        # One filesystem pair for the class; mkfs and mount dominate setup
+        cls._filesystems = RealFilesystemTestSetup()
+        cls.fs1_root, cls.fs2_root = cls._filesystems.setup()
 
-            success = mover_default.move()
-            self.assertTrue(success)
-
-            # Reset for comprehensive test
-            source_dir.mkdir()
-            source_file.write_text("Test content")
-            os.link(source_file, outside_link)
-
-            # Test 2: Comprehensive behavior (should find outside hardlink)
-            dest_dir_comprehensive = fs2_mount / "moved_comprehensive"
-            mover_comprehensive = FileMover(
-                source_dir,
-                dest_dir_comprehensive,
-                create_parents=True,
-                dry_run=False,
-                quiet=True,
-                comprehensive_scan=True,
-            )
+    @classmethod
+    def tearDownClass(cls):
+        cls._filesystems.cleanup()
 
-            success = mover_comprehensive.move()
-            self.assertTrue(success)
+    def setUp(self):
+        """Give each test its own subtree on both shared filesystems"""
+        self.fs1_mount = self.fs1_root / self._testMethodName
+        self.fs2_mount = self.fs2_root / self._testMethodName
+        for mount in (self.fs1_mount, self.fs2_mount):
+            mount.mkdir()
+            self.addCleanup(shutil.rmtree, mount, ignore_errors=True)
 
-            # Verify comprehensive mode moved both files
-            dest_source_file = dest_dir_comprehensive / "test_file.txt"
-            dest_outside_file = fs2_mount / "outside_source.txt"
+    def test_comprehensive_flag_behavior(self):
+        """Test comprehensive vs default scanning behavior"""
 
-            if dest_outside_file.exists():
-                self.assertEqual(
-                    dest_source_file.stat().st_ino, dest_outside_file.stat().st_ino
-                )
-                self.assertEqual(dest_source_file.stat().st_nlink, 2)
-                print("✓ Comprehensive flag preserved cross-scope hardlinks")
-            else:
-                print("! Comprehensive flag behavior needs verification")
+        fs1_mount, fs2_mount = self.fs1_mount, self.fs2_mount
+        # Create complex structure with cross-filesystem hardlinks
+        source_dir = fs1_mount / "source"
+        source_dir.mkdir()
+
+        # Create file in source
+        source_file = source_dir / "test_file.txt"
+        _write(source_file, "Test content")
+
+        # Create hardlink outside source directory but within same filesystem
+        outside_link = fs1_mount / "outside_source.txt"
+        os.link(source_file, outside_link)
+
+        # Verify hardlink exists
+        self.assertEqual(source_file.stat().st_ino, outside_link.stat().st_ino)
+        self.assertEqual(source_file.stat().st_nlink, 2)
+
+        # Test 1: Default behavior (should not find outside hardlink)
+        dest_dir_default = fs2_mount / "moved_default"
+        mover_default = FileMover(
+            source_dir,
+            dest_dir_default,
+            create_parents=True,
+            dry_run=False,
+            quiet=True,
+            comprehensive_scan=False,
+        )
+
+        success = mover_default.move()
+        self.assertTrue(success)
+
+        # Reset for comprehensive test
+        source_dir.mkdir()
+        _write(source_file, "Test content")
+        os.link(source_file, outside_link)
+
+        # Test 2: Comprehensive behavior (should find outside hardlink)
+        dest_dir_comprehensive = fs2_mount / "moved_comprehensive"
+        mover_comprehensive = FileMover(
+            source_dir,
+            dest_dir_comprehensive,
+            create_parents=True,
+            dry_run=False,
+            quiet=True,
+            comprehensive_scan=True,
+        )
+
+        success = mover_comprehensive.move()
+        self.assertTrue(success)
+
+        # Verify comprehensive mode moved both files
+        dest_source_file = dest_dir_comprehensive / "test_file.txt"
+        dest_outside_file = fs2_mount / "outside_source.txt"
+
+        outside_stat = _stat_or_none(dest_outside_file)
+        if outside_stat:
+            source_stat = dest_source_file.stat()
+            self.assertEqual(source_stat.st_ino, outside_stat.st_ino)
+            self.assertEqual(source_stat.st_nlink, 2)
+            print("✓ Comprehensive flag preserved cross-scope hardlinks")
+        else:
+            print("! Comprehensive flag behavior needs verification")
 
     def test_failure_scenarios(self):
         """Test various failure conditions"""
 
-        with RealFilesystemTestSetup() as (fs1_mount, fs2_mount):
-            # Test 1: Invalid source path
-            nonexistent_source = fs1_mount / "does_not_exist"
-            dest_invalid = fs2_mount / "invalid_moved"
-
-            with self.assertRaises(ValueError) as context:
-                FileMover(nonexistent_source, dest_invalid, dry_run=False, quiet=True)
-
-            self.assertIn("Source does not exist", str(context.exception))
-            print("✓ Invalid source detection works")
-
-            # Test 2: Invalid destination parent without create_parents
-            valid_source = fs1_mount / "test.txt"
-            valid_source.write_text("test content")
-            invalid_dest = fs2_mount / "nonexistent" / "path" / "file.txt"
-
-            with self.assertRaises(ValueError) as context:
-                FileMover(
-                    valid_source,
-                    invalid_dest,
-                    create_parents=False,
-                    dry_run=False,
-                    quiet=True,
-                )
+        fs1_mount, fs2_mount = self.fs1_mount, self.fs2_mount
+        # Test 1: Invalid source path
+        nonexistent_source = fs1_mount / "does_not_exist"
+        dest_invalid = fs2_mount / "invalid_moved"
 
-            self.assertIn(
-                "Destination parent directory does not exist", str(context.exception)
-            )
-            print("✓ Invalid destination parent detection works")
+        with self.assertRaises(ValueError) as context:
+            FileMover(nonexistent_source, dest_invalid, dry_run=False, quiet=True)
 
-    def test_cross_scope_hardlink_validation(self):
-        """Test comprehensive validation of cross-scope hardlinks"""
+        self.assertIn("Source does not exist", str(context.exception))
+        print("✓ Invalid source detection works")
 
-        with RealFilesystemTestSetup() as (fs1_mount, fs2_mount):
-            # Create complex cross-scope scenario
-            source_dir = fs1_mount / "move_me"
-            source_dir.mkdir()
+        # Test 2: Invalid destination parent without create_parents
+        valid_source = fs1_mount / "test.txt"
+        _write(valid_source, "test content")
+        invalid_dest = fs2_mount / "nonexistent" / "path" / "file.txt"
 
-            # Create multiple directories with interconnected hardlinks
-            (source_dir / "subdir1").mkdir()
-            (source_dir / "subdir2").mkdir()
-            outside_dir = fs1_mount / "stay_here"
-            outside_dir.mkdir()
-
-            # Pattern 1: File in source, hardlink outside
-            file1 = source_dir / "subdir1" / "shared1.txt"
-            file1.write_text("Shared content 1")
-            outside_link1 = outside_dir / "external1.txt"
-            os.link(file1, outside_link1)
-
-            # Pattern 2: File outside, hardlink in source
-            outside_file2 = outside_dir / "original2.txt"
-            outside_file2.write_text("Shared content 2")
-            inside_link2 = source_dir / "subdir2" / "internal2.txt"
-            os.link(outside_file2, inside_link2)
-
-            # Pattern 3: Multiple hardlinks spanning in/out of source
-            file3 = source_dir / "shared3.txt"
-            file3.write_text("Shared content 3")
-            link3a = source_dir / "subdir1" / "link3a.txt"
-            link3b = outside_dir / "link3b.txt"
-            os.link(file3, link3a)
-            os.link(file3, link3b)
-
-            # Verify initial hardlink structure
-            self.assertEqual(file1.stat().st_nlink, 2)
-            self.assertEqual(outside_file2.stat().st_nlink, 2)
-            self.assertEqual(file3.stat().st_nlink, 3)
-
-            # Test with comprehensive scanning
-            dest_dir = fs2_mount / "comprehensive_moved"
-            mover = FileMover(
-                source_dir,
-                dest_dir,
-                create_parents=True,
+        with self.assertRaises(ValueError) as context:
+            FileMover(
+                valid_source,
+                invalid_dest,
+                create_parents=False,
                 dry_run=False,
                 quiet=True,
-                comprehensive_scan=True,
             )
 
-            success = mover.move()
-            self.assertTrue(success)
-
-            # Validate cross-scope hardlink preservation
-            # Pattern 1: Both files should be moved with preserved structure
-            moved_file1 = dest_dir / "subdir1" / "shared1.txt"
-            moved_outside1 = (
-                fs2_mount / "stay_here" / "external1.txt"
-            )  # Preserved structure
+        self.assertIn(
+            "Destination parent directory does not exist", str(context.exception)
+        )
+        print("✓ Invalid destination parent detection works")
 
-            if moved_outside1.exists():
-                self.assertEqual(
-                    moved_file1.stat().st_ino, moved_outside1.stat().st_ino
-                )
-                self.assertEqual(moved_file1.stat().st_nlink, 2)
-                print(
-                    "✓ Pattern 1: Cross-scope hardlink preserved with directory structure"
-                )
+    def test_cross_scope_hardlink_validation(self):
+        """Test comprehensive validation of cross-scope hardlinks"""
 
-            # Pattern 2: Original outside file and moved inside file should be linked
-            moved_inside2 = dest_dir / "subdir2" / "internal2.txt"
-            moved_outside2 = (
-                fs2_mount / "stay_here" / "original2.txt"
-            )  # Preserved structure
+        fs1_mount, fs2_mount = self.fs1_mount, self.fs2_mount
+        # Create complex cross-scope scenario
+        source_dir = fs1_mount / "move_me"
+        source_dir.mkdir()
+
+        # Create multiple directories with interconnected hardlinks
+        (source_dir / "subdir1").mkdir()
+        (source_dir / "subdir2").mkdir()
+        outside_dir = fs1_mount / "stay_here"
+        outside_dir.mkdir()
+
+        # Pattern 1: File in source, hardlink outside
+        file1 = source_dir / "subdir1" / "shared1.txt"
+        _write(file1, "Shared content 1")
+        outside_link1 = outside_dir / "external1.txt"
+        os.link(file1, outside_link1)
+
+        # Pattern 2: File outside, hardlink in source
+        outside_file2 = outside_dir / "original2.txt"
+        _write(outside_file2, "Shared content 2")
+        inside_link2 = source_dir / "subdir2" / "internal2.txt"
+        os.link(outside_file2, inside_link2)
+
+        # Pattern 3: Multiple hardlinks spanning in/out of source
+        file3 = source_dir / "shared3.txt"
+        _write(file3, "Shared content 3")
+        link3a = source_dir / "subdir1" / "link3a.txt"
+        link3b = outside_dir / "link3b.txt"
+        os.link(file3, link3a)
+        os.link(file3, link3b)
+
+        # Verify initial hardlink structure
+        self.assertEqual(file1.stat().st_nlink, 2)
+        self.assertEqual(outside_file2.stat().st_nlink, 2)
+        self.assertEqual(file3.stat().st_nlink, 3)
+
+        # Test with comprehensive scanning
+        dest_dir = fs2_mount / "comprehensive_moved"
+        mover = FileMover(
+            source_dir,
+            dest_dir,
+            create_parents=True,
+            dry_run=False,
+            quiet=True,
+            comprehensive_scan=True,
+        )
+
+        success = mover.move()
+        self.assertTrue(success)
+
+        # Validate cross-scope hardlink preservation
+        # Pattern 1: Both files should be moved with preserved structure
+        moved_file1 = dest_dir / "subdir1" / "shared1.txt"
+        moved_outside1 = (
+            fs2_mount / "stay_here" / "external1.txt"
+        )  # Preserved structure
+
+        outside1_stat = _stat_or_none(moved_outside1)
+        if outside1_stat:
+            file1_stat = moved_file1.stat()
+            self.assertEqual(file1_stat.st_ino, outside1_stat.st_ino)
+            self.assertEqual(file1_stat.st_nlink, 2)
+            print(
+                "✓ Pattern 1: Cross-scope hardlink preserved with directory structure"
+            )
 
-            if moved_outside2.exists():
-                self.assertEqual(
-                    moved_inside2.stat().st_ino, moved_outside2.stat().st_ino
-                )
-                self.assertEqual(moved_inside2.stat().st_nlink, 2)
-                print(
-                    "✓ Pattern 2: Outside→inside hardlink preserved with directory structure"
-                )
+        # Pattern 2: Original outside file and moved inside file should be linked
+        moved_inside2 = dest_dir / "subdir2" / "internal2.txt"
+        moved_outside2 = (
+            fs2_mount / "stay_here" / "original2.txt"
+        )  # Preserved structure
+
+        outside2_stat = _stat_or_none(moved_outside2)
+        if outside2_stat:
+            inside2_stat = moved_inside2.stat()
+            self.assertEqual(inside2_stat.st_ino, outside2_stat.st_ino)
+            self.assertEqual(inside2_stat.st_nlink, 2)
+            print(
+                "✓ Pattern 2: Outside→inside hardlink preserved with directory structure"
+            )
 
-            # Pattern 3: All three links should be preserved
-            moved_file3 = dest_dir / "shared3.txt"
-            moved_link3a = dest_dir / "subdir1" / "link3a.txt"
-            moved_link3b = fs2_mount / "stay_here" / "link3b.txt"  # Preserved structure
+        # Pattern 3: All three links should be preserved
+        moved_file3 = dest_dir / "shared3.txt"
+        moved_link3a = dest_dir / "subdir1" / "link3a.txt"
+        moved_link3b = fs2_mount / "stay_here" / "link3b.txt"  # Preserved structure
 
-            if moved_link3b.exists():
-                base_inode = moved_file3.stat().st_ino
-                self.assertEqual(moved_link3a.stat().st_ino, base_inode)
-                self.assertEqual(moved_link3b.stat().st_ino, base_inode)
-                self.assertEqual(moved_file3.stat().st_nlink, 3)
-                print("✓ Pattern 3: Multiple cross-scope hardlinks preserved")
+        link3b_stat = _stat_or_none(moved_link3b)
+        if link3b_stat:
+            file3_stat = moved_file3.stat()
+            self.assertEqual(moved_link3a.stat().st_ino, file3_stat.st_ino)
+            self.assertEqual(link3b_stat.st_ino, file3_stat.st_ino)
+            self.assertEqual(file3_stat.st_nlink, 3)
+            print("✓ Pattern 3: Multiple cross-scope hardlinks preserved")
 
-            # Verify source cleanup
-            self.assertFalse(source_dir.exists())
-            print("✓ Source directory properly cleaned up")
+        # Verify source cleanup
+        self.assertFalse(source_dir.exists())
+        print("✓ Source directory properly cleaned up")
 
     def test_dry_run_comprehensive_preview(self):
         """Test dry-run mode with comprehensive scanning"""
 
-        with RealFilesystemTestSetup() as (fs1_mount, fs2_mount):
-            # Create test structure
-            source_dir = fs1_mount / "preview_test"
-            source_dir.mkdir()
+        fs1_mount, fs2_mount = self.fs1_mount, self.fs2_mount
+        # Create test structure
+        source_dir = fs1_mount / "preview_test"
+        source_dir.mkdir()
 
-            test_file = source_dir / "test.txt"
-            test_file.write_text("Preview content")
+        test_file = source_dir / "test.txt"
+        _write(test_file, "Preview content")
 
-            outside_link = fs1_mount / "outside.txt"
-            os.link(test_file, outside_link)
+        outside_link = fs1_mount / "outside.txt"
+        os.link(test_file, outside_link)
 
-            # Test dry-run with comprehensive
-            dest_dir = fs2_mount / "preview_moved"
-            mover = FileMover(
-                source_dir,
-                dest_dir,
-                create_parents=True,
-                dry_run=True,
-                quiet=False,
-                comprehensive_scan=True,
-            )
+        # Test dry-run with comprehensive
+        dest_dir = fs2_mount / "preview_moved"
+        mover = FileMover(
+            source_dir,
+            dest_dir,
+            create_parents=True,
+            dry_run=True,
+            quiet=False,
+            comprehensive_scan=True,
+        )
 
-            success = mover.move()
-            self.assertTrue(success)
+        success = mover.move()
+        self.assertTrue(success)
 
-            # Verify nothing was actually moved in dry-run
-            self.assertTrue(source_dir.exists())
-            self.assertTrue(test_file.exists())
-            self.assertTrue(outside_link.exists())
-            self.assertFalse(dest_dir.exists())
+        # Verify nothing was actually moved in dry-run
+        self.assertTrue(source_dir.exists())
+        self.assertTrue(test_file.exists())
+        self.assertTrue(outside_link.exists())
+        self.assertFalse(dest_dir.exists())
 
-            # Verify hardlinks still intact
-            self.assertEqual(test_file.stat().st_nlink, 2)
-            print("✓ Dry-run preserves source files and shows comprehensive preview")
+        # Verify hardlinks still intact
+        self.assertEqual(test_file.stat().st_nlink, 2)
+        print("✓ Dry-run preserves source files and shows comprehensive preview")
 
 
 class TestLargeScalePerformance(unittest.TestCase):
@@ -401,29 +656,23 @@ class TestLargeScalePerformance(unittest.TestCase):
             links_per_group = 12
 
             print(f"Creating {num_file_groups * (links_per_group + 1)} files...")
-            creation_start = time.time()
+            creation_start = time.perf_counter()
 
-            for i in range(num_file_groups):
-                group_dir = source_dir / f"group_{i:05d}"
-                group_dir.mkdir()
-
-                # Create original file
-                original = group_dir / f"original_{i}.txt"
-                original.write_text(f"Content {i}")  # Small content
-
-                # Create hardlinks in different subdirectories
-                for j in range(links_per_group):
-                    link_dir = source_dir / f"links_{j:02d}"
-                    link_dir.mkdir(exist_ok=True)
-                    link = link_dir / f"link_{i:05d}_{j}.txt"
-                    os.link(original, link)
+            # Each group is an original plus hardlinks in shared subdirectories
+            _build_link_dataset(
+                source_dir,
+                num_file_groups,
+                links_per_group,
+                "group_{i:05d}/original_{i}.txt",
+                "links_{j:02d}/link_{i:05d}_{j}.txt",
+            )
 
-            creation_time = time.time() - creation_start
+            creation_time = time.perf_counter() - creation_start
 
             # Test comprehensive scanning performance
             dest_dir = fs2_mount / "large_moved"
 
-            move_start = time.time()
+            move_start = time.perf_counter()
             mover = FileMover(
                 source_dir,
                 dest_dir,
@@ -433,13 +682,12 @@ class TestLargeScalePerformance(unittest.TestCase):
                 comprehensive_scan=True,
             )
             success = mover.move()
-            move_time = time.time() - move_start
+            move_time = time.perf_counter() - move_start
 
             self.assertTrue(success)
 
             total_files = num_file_groups * (links_per_group + 1)
-            moved_files = list(dest_dir.rglob("*.txt"))
-            self.assertEqual(len(moved_files), total_files)
+            self.assertEqual(_count_txt(dest_dir), total_files)
 
             print(f"✓ Large scale test: {total_files} files")
             print(f"  Creation time: {creation_time:.2f}s")
@@ -462,27 +710,21 @@ class TestLargeScalePerformance(unittest.TestCase):
             base_dir = fs1_mount / "existing_dataset"
             base_dir.mkdir()
 
-            setup_start = time.time()
-            for i in range(10000):  # Create 10,000 hardlink groups
-                group_dir = base_dir / f"group_{i:05d}"
-                group_dir.mkdir()
-
-                # Create original file
-                original = group_dir / f"file_{i}.txt"
-                original.write_text(f"content_{i}")
-
-                # Create 5 hardlinks per group = 60,000 total files
-                for j in range(5):
-                    link_dir = base_dir / f"links_{j}"
-                    link_dir.mkdir(exist_ok=True)
-                    link_path = link_dir / f"hardlink_{i:05d}_{j}.txt"
-                    os.link(original, link_path)
+            setup_start = time.perf_counter()
+            # 10,000 groups of an original plus 5 hardlinks = 60,000 files
+            _build_link_dataset(
+                base_dir,
+                10000,
+                5,
+                "group_{i:05d}/file_{i}.txt",
+                "links_{j}/hardlink_{i:05d}_{j}.txt",
+            )
 
-            setup_time = time.time() - setup_start
+            setup_time = time.perf_counter() - setup_start
             total_files = 60000  # 10k originals + 50k hardlinks
 
             # Phase 2: Benchmark hardlink detection (the actual test)
-            scan_start = time.time()
+            scan_start = time.perf_counter()
             mover = CrossFilesystemMover(
                 base_dir,
                 fs2_mount / "moved",
@@ -493,11 +735,11 @@ class TestLargeScalePerformance(unittest.TestCase):
 
             # Trigger hardlink index building - this is what we're benchmarking
             mover._build_hardlink_index()
-            scan_time = time.time() - scan_start
+            scan_time = time.perf_counter() - scan_start
 
             # Phase 3: Validate results
             hardlink_groups = len(mover.hardlink_index)
-            indexed_files = sum(len(paths) for paths in mover.hardlink_index.values())
+            indexed_files = mover.hardlink_index.path_count()
 
             # Report performance metrics
             print(f"Dataset creation: {setup_time:.2f}s for {total_files} files")
@@ -3,15 +3,18 @@
 Integration tests for SmartMove
 """
 
+import io
 import os
 import shutil
 import tempfile
+import time
 import unittest
+from contextlib import redirect_stdout
 from pathlib import Path
 from unittest.mock import patch
 
 from smartmove.core import CrossFilesystemMover, FileMover
-from smartmove.utils import DirectoryManager
+from smartmove.utils import DirectoryManager, HardlinkIndex
 
 
 class TestSmartMoveIntegration(unittest.TestCase):
@@ -220,15 +223,13 @@ class TestSmartMoveIntegration(unittest.TestCase):
 
         created_groups = self._create_hardlinked_files(self.source_dir, file_groups)
 
-        import time
-
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         dest_path = self.dest_dir / "perf_test"
         mover = FileMover(self.source_dir, dest_path, create_parents=True, dry_run=True)
         success = mover.move()
 
-        end_time = time.time()
+        end_time = time.perf_counter()
         duration = end_time - start_time
 
         self.assertTrue(success, "Performance test should succeed")
@@ -332,17 +333,18 @@ class TestSmartMoveIntegration(unittest.TestCase):
             dir_manager=None,
         )
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value.returncode = 0
-            mock_run.return_value.stdout = "12345 /path/file.txt\n"
-
+        with patch.object(
+            cross_mover,
+            "_build_hardlink_index_parallel",
+            return_value=HardlinkIndex([(12345, "/path/file.txt")]),
+        ) as mock_scan:
             test_files = created_groups["test_group"]
 
             cross_mover.find_hardlinks(test_files[0])
-            first_call_count = mock_run.call_count
+            first_call_count = mock_scan.call_count
 
             cross_mover.find_hardlinks(test_files[1])
-            second_call_count = mock_run.call_count
+            second_call_count = mock_scan.call_count
 
             self.assertEqual(
                 first_call_count,
@@ -429,9 +431,6 @@ class TestSmartMoveIntegration(unittest.TestCase):
 
     def test_progress_integration_with_move(self):
         """Test progress reporting during directory move operations"""
-        import io
-        from contextlib import redirect_stdout
-
         # Create test files in directory
         for i in range(25):
             (self.source_dir / f"file_{i}.txt").write_text(f"content {i}")
@@ -452,9 +451,6 @@ class TestSmartMoveIntegration(unittest.TestCase):
 
     def test_progress_disabled_in_quiet_mode(self):
         """Test progress is disabled when quiet=True"""
-        import io
-        from contextlib import redirect_stdout
-
         for i in range(15):
             (self.source_dir / f"file_{i}.txt").write_text(f"content {i}")
 
@@ -481,9 +477,6 @@ class TestSmartMoveIntegration(unittest.TestCase):
         )
 
         # Should not show progress even with files
-        import io
-        from contextlib import redirect_stdout
-
         captured_output = io.StringIO()
         with redirect_stdout(captured_output):
             success = mover.move()
@@ -608,9 +601,6 @@ class TestLoggingAccuracy(unittest.TestCase):
 
     def test_logged_paths_are_valid(self):
         """Test that logged paths are valid and constructible"""
-        import io
-        from contextlib import redirect_stdout
-
         source_file = self.source_dir / "test.txt"
         source_file.write_text("content")
         dest_file = self.dest_dir / "moved.txt"
@@ -766,7 +756,7 @@ class TestEdgeCaseHandling(unittest.TestCase):
         )
 
         # Mock disk space exhaustion
-        with patch("shutil.copy2") as mock_copy:
+        with patch("os.copy_file_range") as mock_copy:
             mock_copy.side_effect = OSError(28, "No space left on device")
 
             # Should handle gracefully, not crash
@@ -815,7 +805,7 @@ class TestEdgeCaseHandling(unittest.TestCase):
         )
 
         # Save original function before patching
-        original_copy2 = shutil.copy2
+        original_kernel_copy = mover._kernel_copy
         call_count = 0
 
         def mock_copy_with_retry(*args, **kwargs):
@@ -824,9 +814,9 @@ class TestEdgeCaseHandling(unittest.TestCase):
             if call_count == 1:
                 raise PermissionError("Permission denied")
             else:
-                return original_copy2(*args, **kwargs)
+                return original_kernel_copy(*args, **kwargs)
 
-        with patch("shutil.copy2", side_effect=mock_copy_with_retry):
+        with patch.object(mover, "_kernel_copy", side_effect=mock_copy_with_retry):
             result = mover.create_file(source_file, dest_file)
             self.assertTrue(result, "Should retry on permission error")
 
@@ -4,16 +4,23 @@ Unit tests for SmartMove components
 Updated with new optimizations (mount point detection, memory index)
 """
 
+import errno
+import io
 import os
+import pkgutil
 import shutil
-import subprocess
+import signal
 import tempfile
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, redirect_stdout
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 from smartmove.core import CrossFilesystemMover, FileMover
-from smartmove.utils import DirectoryManager, ProgressReporter
+from smartmove.utils import DirectoryManager, HardlinkIndex, ProgressReporter
+from smartmove.utils.output import ActionPrinter, format_timestamp
 
 
 class TestDirectoryManager(unittest.TestCase):
@@ -47,6 +54,82 @@ class TestDirectoryManager(unittest.TestCase):
             self.dir_manager.ensure_directory(test_path)
             mock_mkdir.assert_not_called()
 
+    def test_existing_directory_is_cached(self):
+        """Test existing directories are cached so later calls skip the stat"""
+        self.dir_manager.ensure_directory(self.temp_dir)
+        self.assertIn(self.temp_dir, self.dir_manager.created_dirs)
+
+        with patch("pathlib.Path.exists") as mock_exists:
+            self.dir_manager.ensure_directory(self.temp_dir)
+            mock_exists.assert_not_called()
+
+    def test_ensure_directories_creates_all(self):
+        """Test batch creation handles nested and duplicate paths"""
+        paths = [
+            self.temp_dir / "a" / "b" / "c",
+            self.temp_dir / "a",
+            self.temp_dir / "a" / "b" / "c",
+            self.temp_dir / "d",
+        ]
+        self.dir_manager.ensure_directories(paths)
+
+        for path in paths:
+            self.assertTrue(path.is_dir())
+            self.assertIn(path, self.dir_manager.created_dirs)
+
+    def test_ensure_directories_single_mkdir_per_path(self):
+        """Test batch creation issues one mkdir per directory without stat probes"""
+        existing = self.temp_dir / "existing"
+        existing.mkdir()
+        paths = [existing, existing / "new", self.temp_dir / "gap" / "leaf"]
+        with patch.dict(os.environ, {"SUDO_UID": "12345", "SUDO_GID": "12345"}):
+            self.dir_manager = DirectoryManager(dry_run=False)
+
+        with patch("pathlib.Path.exists") as mock_exists:
+            with patch("os.mkdir", wraps=os.mkdir) as mock_mkdir:
+                with patch("os.chown") as mock_chown:
+                    self.dir_manager.ensure_directories(paths[:2])
+
+        mock_exists.assert_not_called()
+        self.assertEqual(mock_mkdir.call_count, 2)
+        mock_chown.assert_called_once()
+        self.assertTrue((existing / "new").is_dir())
+
+        # A path whose parent holds no files falls back to recursive creation
+        self.dir_manager.ensure_directories(paths[2:])
+        self.assertTrue(paths[2].is_dir())
+
+    def test_ensure_directory_caches_ancestors(self):
+        """Test creating a deep path caches its ancestors without stat probes"""
+        test_path = self.temp_dir / "a" / "b" / "c"
+        with patch("pathlib.Path.exists") as mock_exists:
+            self.dir_manager.ensure_directory(test_path)
+        mock_exists.assert_not_called()
+
+        for ancestor in (self.temp_dir / "a", self.temp_dir / "a" / "b"):
+            self.assertIn(ancestor, self.dir_manager.created_dirs)
+        with patch("os.mkdir") as mock_mkdir:
+            self.dir_manager.ensure_directory(self.temp_dir / "a" / "b")
+            mock_mkdir.assert_not_called()
+
+    def test_chown_skipped_when_owner_already_matches(self):
+        """Test new directories are not chowned to the user that created them"""
+        env = {"SUDO_UID": str(os.geteuid()), "SUDO_GID": str(os.getegid())}
+        with patch.dict(os.environ, env):
+            dir_manager = DirectoryManager(dry_run=False)
+
+        with patch("os.chown") as mock_chown:
+            dir_manager.ensure_directory(self.temp_dir / "plain")
+        mock_chown.assert_not_called()
+
+        # Directories under a setgid parent still get the explicit chown
+        shared = self.temp_dir / "shared"
+        shared.mkdir()
+        os.chmod(shared, 0o2775)
+        with patch("os.chown") as mock_chown:
+            dir_manager.ensure_directory(shared / "child")
+        mock_chown.assert_called_once_with(shared / "child", os.geteuid(), os.getegid())
+
     def test_dry_run_mode(self):
         """Test that dry-run mode prevents actual directory creation"""
         dry_manager = DirectoryManager(dry_run=True)
@@ -63,6 +146,164 @@ class TestDirectoryManager(unittest.TestCase):
         )
 
 
+class TestActionPrinter(unittest.TestCase):
+    def test_burst_is_written_in_one_batch(self):
+        """Test lines arriving together are buffered until the batch fills"""
+        printer = ActionPrinter(max_lines=3, max_delay=60)
+        captured_output = io.StringIO()
+
+        with redirect_stdout(captured_output):
+            printer.print("first")
+            printer.print("second")
+            self.assertEqual(captured_output.getvalue(), "")
+
+            printer.print("third")
+            lines = captured_output.getvalue().splitlines()
+
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].endswith(" - first"))
+        self.assertTrue(lines[2].endswith(" - third"))
+
+    def test_isolated_line_written_immediately(self):
+        """Test a line after a quiet period is not held back"""
+        printer = ActionPrinter(max_lines=256, max_delay=0)
+        captured_output = io.StringIO()
+
+        with redirect_stdout(captured_output):
+            printer.print("only")
+
+        self.assertTrue(captured_output.getvalue().endswith(" - only\n"))
+
+    def test_pending_lines_written_after_max_delay(self):
+        """Test the tail of a burst is written without waiting for another line"""
+        printer = ActionPrinter(max_lines=256, max_delay=0.05)
+        captured_output = io.StringIO()
+
+        with redirect_stdout(captured_output):
+            printer.print("first")
+            printer.print("last")
+            time.sleep(0.5)
+
+        self.assertIn(" - last", captured_output.getvalue())
+
+    def test_flush_writes_pending_lines(self):
+        """Test flush drains queued lines"""
+        printer = ActionPrinter(max_lines=256, max_delay=60)
+        captured_output = io.StringIO()
+
+        with redirect_stdout(captured_output):
+            printer.print("pending")
+            printer.flush()
+
+        self.assertIn(" - pending", captured_output.getvalue())
+
+
+class TestHardlinkIndex(unittest.TestCase):
+    def test_groups_paths_by_inode(self):
+        """Test paths are grouped per inode and looked up like a dict"""
+        index = HardlinkIndex(
+            [(30, "/src/c1"), (10, "/src/a1"), (30, "/src/c2"), (10, "/src/a2")]
+        )
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual(list(index), [10, 30])
+        self.assertEqual(index[10], [Path("/src/a1"), Path("/src/a2")])
+        self.assertEqual(index[30], [Path("/src/c1"), Path("/src/c2")])
+        self.assertEqual(index.path_count(), 4)
+
+    def test_missing_inode(self):
+        """Test lookups for unknown inodes fall back like a dict"""
+        index = HardlinkIndex([(10, "/src/a1")])
+
+        self.assertNotIn(20, index)
+        self.assertEqual(index.get(20, ["fallback"]), ["fallback"])
+        with self.assertRaises(KeyError):
+            index[5]
+
+    def test_empty_index(self):
+        """Test empty index behaves as an empty mapping"""
+        index = HardlinkIndex()
+
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.path_count(), 0)
+        self.assertIsNone(index.get(1))
+
+    def test_non_utf8_path_round_trip(self):
+        """Test undecodable filenames survive encoding into the buffer"""
+        name = os.fsdecode(b"/src/caf\xe9")
+        index = HardlinkIndex([(7, name)])
+
+        self.assertEqual(index[7], [Path(name)])
+
+    def test_save_and_load_round_trip(self):
+        """Test an index written to disk loads back unchanged"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = Path(temp_dir) / "index.idx"
+            index = HardlinkIndex([(10, "/src/a"), (10, "/src/b"), (3, "/src/c")])
+            index.save(cache_path)
+
+            loaded = HardlinkIndex.load(cache_path)
+
+            self.assertEqual(dict(loaded), dict(index))
+            self.assertEqual(loaded.path_count(), 3)
+
+    def test_load_rejects_malformed_cache(self):
+        """Test foreign or truncated cache files raise ValueError"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = Path(temp_dir) / "index.idx"
+            HardlinkIndex([(10, "/src/a"), (10, "/src/b")]).save(cache_path)
+            data = cache_path.read_bytes()
+
+            for content in (b"garbage", data[:-3]):
+                cache_path.write_bytes(content)
+                with self.assertRaises(ValueError):
+                    HardlinkIndex.load(cache_path)
+
+    def test_load_rejects_inconsistent_arrays(self):
+        """Test well-sized caches with out-of-range offsets or groups raise"""
+        corruptions = (
+            ("_offsets", 1, 1 << 40),
+            ("_groups", 1, 5),
+            ("_inodes", 0, 30),
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = Path(temp_dir) / "index.idx"
+            for field, position, value in corruptions:
+                with self.subTest(field=field):
+                    index = HardlinkIndex([(10, "/src/a"), (20, "/src/b")])
+                    getattr(index, field)[position] = value
+                    index.save(cache_path)
+                    with self.assertRaises(ValueError):
+                        HardlinkIndex.load(cache_path)
+
+
+class TestOutputHelpers(unittest.TestCase):
+    def test_format_timestamp_matches_log_format(self):
+        """Test timestamps use the logging asctime layout with milliseconds"""
+        with patch("time.time_ns", return_value=1_700_000_000_123_456_789):
+            timestamp = format_timestamp()
+
+        expected = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(1_700_000_000))
+        self.assertEqual(timestamp, f"{expected},123")
+
+    def test_format_timestamp_reuses_formatted_second(self):
+        """Test the date part is formatted once per second"""
+        times = [1_700_000_000_001_000_000, 1_700_000_000_999_000_000]
+        with (
+            patch("smartmove.utils.output._second_cache", (None, "")),
+            patch("time.time_ns", side_effect=times + [1_700_000_001_000_000_000]),
+        ):
+            with patch("time.strftime", wraps=time.strftime) as mock_strftime:
+                first = format_timestamp()
+                second = format_timestamp()
+                self.assertEqual(mock_strftime.call_count, 1)
+                third = format_timestamp()
+                self.assertEqual(mock_strftime.call_count, 2)
+
+        self.assertEqual(first[:-4], second[:-4])
+        self.assertEqual((first[-3:], second[-3:], third[-3:]), ("001", "999", "000"))
+
+
 class TestCrossFilesystemMover(unittest.TestCase):
     def setUp(self):
         self.temp_dir = Path(tempfile.mkdtemp())
@@ -81,6 +322,33 @@ class TestCrossFilesystemMover(unittest.TestCase):
             dir_manager=self.dir_manager,
         )
 
+    def _real_mover(self):
+        """Create a mover that writes to the destination"""
+        return CrossFilesystemMover(
+            self.source_dir,
+            self.dest_dir,
+            dry_run=False,
+            quiet=True,
+            dir_manager=DirectoryManager(dry_run=False),
+        )
+
+    @contextmanager
+    def _copy_fds(self, name="data.bin", payload=b"payload"):
+        """Write a source file and yield fds to it and a new destination"""
+        source_file = self.source_dir / name
+        source_file.write_bytes(payload)
+        src_fd = os.open(source_file, os.O_RDONLY)
+        try:
+            dst_fd = os.open(
+                self.dest_dir / name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+            )
+            try:
+                yield src_fd, dst_fd
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+
     def test_mount_point_detection(self):
         """Test mount point detection using os.path.ismount"""
         # Test with mock mount point
@@ -108,32 +376,46 @@ class TestCrossFilesystemMover(unittest.TestCase):
 
     def test_hardlink_index_building(self):
         """Test memory index building for hardlinks"""
-        # Mock subprocess.run to simulate find command output
-        mock_output = "12345 /path/to/file1.txt\n12345 /path/to/file2.txt\n67890 /path/to/file3.txt\n"
-
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value.returncode = 0
-            mock_run.return_value.stdout = mock_output
+        file1 = self.source_dir / "file1.txt"
+        file1.write_text("shared")
+        os.link(file1, self.source_dir / "file2.txt")
+        (self.source_dir / "nested").mkdir()
+        file3 = self.source_dir / "nested" / "file3.txt"
+        file3.write_text("other")
+        os.link(file3, self.temp_dir / "outside.txt")
+        (self.source_dir / "single.txt").write_text("single")
+
+        self.mover.source_root = self.temp_dir
+        self.mover._build_hardlink_index()
+
+        # Verify index was built correctly
+        self.assertIsNotNone(self.mover.hardlink_index)
+        self.assertIn(file1.stat().st_ino, self.mover.hardlink_index)
+        self.assertIn(file3.stat().st_ino, self.mover.hardlink_index)
+        self.assertEqual(len(self.mover.hardlink_index[file1.stat().st_ino]), 2)
+        self.assertEqual(len(self.mover.hardlink_index[file3.stat().st_ino]), 2)
+        self.assertEqual(len(self.mover.hardlink_index), 2)
 
-            self.mover._build_hardlink_index()
+    def test_hardlink_index_error_handling(self):
+        """Test hardlink index skips unreadable subdirectories"""
+        file1 = self.source_dir / "file1.txt"
+        file1.write_text("shared")
+        os.link(file1, self.source_dir / "file2.txt")
+        (self.source_dir / "blocked").mkdir()
 
-            # Verify index was built correctly
-            self.assertIsNotNone(self.mover.hardlink_index)
-            self.assertIn(12345, self.mover.hardlink_index)
-            self.assertIn(67890, self.mover.hardlink_index)
-            self.assertEqual(len(self.mover.hardlink_index[12345]), 2)
-            self.assertEqual(len(self.mover.hardlink_index[67890]), 1)
+        real_open = os.open
 
-    def test_hardlink_index_error_handling(self):
-        """Test hardlink index handles errors gracefully"""
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value.returncode = 1
-            mock_run.return_value.stderr = "Permission denied"
+        def open_side_effect(path, flags, *args, **kwargs):
+            if str(path).endswith("blocked"):
+                raise PermissionError("Permission denied")
+            return real_open(path, flags, *args, **kwargs)
 
-            self.mover._build_hardlink_index()
+        self.mover.source_root = self.source_dir
+        with patch("os.open", side_effect=open_side_effect):
+            with self.assertLogs(level="WARNING"):
+                self.mover._build_hardlink_index()
 
-            # Should create empty index on error
-            self.assertEqual(self.mover.hardlink_index, {})
+        self.assertEqual(len(self.mover.hardlink_index), 1)
 
     def test_find_hardlinks_single_file(self):
         """Test hardlink detection for files without hardlinks"""
@@ -199,6 +481,43 @@ class TestCrossFilesystemMover(unittest.TestCase):
                 self.assertEqual(len(hardlinks), 1)
                 self.assertEqual(hardlinks[0], test_file)
 
+    def test_zero_move_threads_picks_automatic_count(self):
+        """Test move_threads=0 resolves to an I/O-oriented thread count"""
+        for cpus, expected in ((2, 8), (64, 32), (None, 4)):
+            with patch("os.cpu_count", return_value=cpus):
+                mover = CrossFilesystemMover(
+                    self.source_dir, self.dest_dir, quiet=True, move_threads=0
+                )
+            self.assertEqual(mover.move_threads, expected)
+
+    def test_per_thread_accumulators_are_merged(self):
+        """Test each scanning thread gets its own accumulator shard"""
+        from smartmove.core.filesystem import _PerThread
+
+        accumulators = _PerThread(list)
+
+        def collect(value):
+            accumulators.get().append(value)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(collect, range(100)))
+        collect(100)
+
+        merged = sorted(v for shard in accumulators.shards for v in shard)
+        self.assertEqual(merged, list(range(101)))
+        self.assertLessEqual(len(accumulators.shards), 5)
+
+    def test_find_hardlinks_uses_provided_stat(self):
+        """Test that a pre-fetched stat result avoids re-stating the file"""
+        mock_file = MagicMock()
+        file_stat = type("MockStat", (), {"st_nlink": 2, "st_ino": 12345})()
+        self.mover.hardlink_index = {12345: [Path("/a.txt"), Path("/b.txt")]}
+
+        hardlinks = self.mover.find_hardlinks(mock_file, file_stat)
+
+        mock_file.stat.assert_not_called()
+        self.assertEqual(hardlinks, [Path("/a.txt"), Path("/b.txt")])
+
     def test_map_hardlink_destination_within_scope(self):
         """Test hardlink destination mapping for files within move scope"""
         source_file = self.source_dir / "subdir" / "file.txt"
@@ -223,23 +542,193 @@ class TestCrossFilesystemMover(unittest.TestCase):
         dest_file = self.dest_dir / "copied.txt"
 
         # Test in non-dry-run mode
-        real_mover = CrossFilesystemMover(
-            self.source_dir,
-            self.dest_dir,
-            dry_run=False,
-            quiet=True,
-            dir_manager=DirectoryManager(dry_run=False),
+        real_mover = self._real_mover()
+
+        os.chmod(source_file, 0o640)
+        os.utime(source_file, ns=(1_000_000_000, 2_000_000_000))
+        source_stat = source_file.stat()
+        # Source owner differs from the process, so chown is attempted
+        real_mover._euid = source_stat.st_uid + 1
+
+        with patch("os.fchown") as mock_fchown:
+            success = real_mover.create_file(source_file, dest_file)
+
+        self.assertTrue(success)
+        self.assertEqual(dest_file.read_text(), "test content")
+        dest_stat = dest_file.stat()
+        self.assertEqual(dest_stat.st_mode & 0o7777, 0o640)
+        self.assertEqual(dest_stat.st_mtime_ns, 2_000_000_000)
+        mock_fchown.assert_called_once()
+        self.assertEqual(
+            mock_fchown.call_args[0][1:], (source_stat.st_uid, source_stat.st_gid)
         )
 
-        with patch("shutil.copy2") as mock_copy:
-            with patch("os.chmod") as mock_chmod:
-                with patch("os.chown") as mock_chown:
-                    success = real_mover.create_file(source_file, dest_file)
+    @unittest.skipUnless(hasattr(os, "O_NOATIME"), "O_NOATIME is Linux-only")
+    def test_kernel_copy_retries_open_without_noatime(self):
+        """Test sources not owned by the process are opened without O_NOATIME"""
+        source_file = self.source_dir / "data.bin"
+        source_file.write_bytes(b"payload")
+        dest_file = self.dest_dir / "data.bin"
+        real_open = os.open
+
+        def open_side_effect(path, flags, *args, **kwargs):
+            if flags & os.O_NOATIME:
+                raise PermissionError("Operation not permitted")
+            return real_open(path, flags, *args, **kwargs)
+
+        with patch("os.open", side_effect=open_side_effect) as mock_open:
+            self.mover._kernel_copy(source_file, dest_file, source_file.stat())
+
+        self.assertEqual(dest_file.read_bytes(), b"payload")
+        self.assertEqual(mock_open.call_count, 3)
+
+    def test_create_file_rejects_named_pipe(self):
+        """Test a FIFO in the source fails the copy instead of blocking on open"""
+        fifo = self.source_dir / "pipe"
+        os.mkfifo(fifo)
+        real_mover = self._real_mover()
+
+        with self.assertLogs(level="ERROR") as log:
+            self.assertFalse(real_mover.create_file(fifo, self.dest_dir / "pipe"))
+
+        self.assertIn("is a named pipe", log.output[0])
+        self.assertFalse((self.dest_dir / "pipe").exists())
+
+    def test_copy_data_reflinks_when_supported(self):
+        """Test a successful reflink skips every byte-copy path"""
+        # The mocked clone writes nothing, so an empty source passes the size check
+        with self._copy_fds(payload=b"") as (src_fd, dst_fd):
+            with patch("fcntl.ioctl") as mock_ioctl:
+                with patch("os.copy_file_range") as mock_cfr:
+                    self.mover._copy_data(src_fd, dst_fd)
+
+        mock_ioctl.assert_called_once()
+        mock_cfr.assert_not_called()
+
+    def test_copy_data_rejects_short_copy(self):
+        """Test a copy ending before the source size raises instead of succeeding"""
+        with self._copy_fds() as (src_fd, dst_fd):
+            with patch.object(self.mover, "_copy_contents"):
+                with self.assertRaises(OSError) as context:
+                    self.mover._copy_data(src_fd, dst_fd)
+
+        self.assertEqual(context.exception.errno, errno.EIO)
+
+    def test_copy_data_falls_back_and_remembers_unsupported_paths(self):
+        """Test each failing copy path hands over to the next and is not retried"""
+        cases = (
+            # Failing calls, their errno (None: copy nothing), copying call,
+            # capability flags cleared afterwards
+            (("fcntl.ioctl",), errno.EXDEV, "os.copy_file_range", ("_use_reflink",)),
+            (
+                ("os.copy_file_range",),
+                errno.EXDEV,
+                "os.sendfile",
+                ("_use_copy_file_range",),
+            ),
+            (
+                ("os.copy_file_range", "os.sendfile"),
+                errno.ENOSYS,
+                "shutil.copyfileobj",
+                ("_use_copy_file_range", "_use_sendfile"),
+            ),
+            (("os.copy_file_range", "os.sendfile"), None, "shutil.copyfileobj", ()),
+        )
+        for failing, error, tier, disabled in cases:
+            with self.subTest(failing=failing, errno=error):
+                mover = self._real_mover()
+                mover._use_reflink = "fcntl.ioctl" in failing
+                outcome = (
+                    {"return_value": 0}
+                    if error is None
+                    else {"side_effect": OSError(error, os.strerror(error))}
+                )
+                with ExitStack() as stack:
+                    mocks = [stack.enter_context(patch(t, **outcome)) for t in failing]
+                    copier = stack.enter_context(
+                        patch(tier, wraps=pkgutil.resolve_name(tier))
+                    )
+                    for name in ("first.bin", "second.bin"):
+                        with self._copy_fds(name, b"payload" * 1000) as fds:
+                            mover._copy_data(*fds)
+                        dest_file = self.dest_dir / name
+                        self.assertEqual(dest_file.read_bytes(), b"payload" * 1000)
+
+                # Unsupported paths are tried once; empty copies on every file
+                for mock in mocks:
+                    self.assertEqual(mock.call_count, 2 if error is None else 1)
+                self.assertTrue(copier.called)
+                for flag in ("_use_reflink", "_use_copy_file_range", "_use_sendfile"):
+                    if flag in disabled:
+                        self.assertFalse(getattr(mover, flag))
+                    elif flag != "_use_reflink":
+                        self.assertTrue(getattr(mover, flag))
+
+    def test_create_file_skips_chown_for_own_files(self):
+        """Test chown is skipped when the process already owns the source IDs"""
+        real_mover = self._real_mover()
+        source_file = self.source_dir / "own.txt"
+        source_file.write_text("content")
+        source_stat = source_file.stat()
+        real_mover._euid = source_stat.st_uid
+        real_mover._egid = source_stat.st_gid
+
+        with patch("os.fchown") as mock_fchown:
+            self.assertTrue(
+                real_mover.create_file(source_file, self.dest_dir / "own.txt")
+            )
+        mock_fchown.assert_not_called()
+
+        # A setgid destination directory hands its group to new files
+        os.chmod(self.dest_dir, 0o2755)
+        real_mover._setgid_dirs.clear()
+        with patch("os.fchown") as mock_fchown:
+            self.assertTrue(
+                real_mover.create_file(source_file, self.dest_dir / "own2.txt")
+            )
+        mock_fchown.assert_called_once()
+
+        # An existing destination keeps its old owner when truncated
+        os.chmod(self.dest_dir, 0o755)
+        real_mover._setgid_dirs.clear()
+        with patch("os.fchown") as mock_fchown:
+            self.assertTrue(
+                real_mover.create_file(source_file, self.dest_dir / "own.txt")
+            )
+        mock_fchown.assert_called_once()
+
+    def test_create_file_copies_data_grown_after_scan(self):
+        """Test a file empty at scan time but grown since is copied in full"""
+        real_mover = self._real_mover()
+        source_file = self.source_dir / "growing.txt"
+        source_file.touch()
+        scanned_stat = source_file.stat()
+        source_file.write_text("appended later")
+        dest_file = self.dest_dir / "growing.txt"
+
+        self.assertTrue(
+            real_mover.create_file(source_file, dest_file, source_stat=scanned_stat)
+        )
+        self.assertEqual(dest_file.read_text(), "appended later")
+
+    def test_create_file_uses_provided_stat(self):
+        """Test that create_file applies a pre-fetched stat without re-stating"""
+        source_file = MagicMock()
+        dest_file = self.dest_dir / "copied.txt"
+        source_stat = type(
+            "MockStat", (), {"st_mode": 0o100640, "st_uid": 1234, "st_gid": 5678}
+        )()
 
-                    self.assertTrue(success)
-                    mock_copy.assert_called_once_with(source_file, dest_file)
-                    mock_chmod.assert_called_once()
-                    mock_chown.assert_called_once()
+        real_mover = self._real_mover()
+
+        with patch.object(real_mover, "_kernel_copy") as mock_copy:
+            success = real_mover.create_file(
+                source_file, dest_file, source_stat=source_stat
+            )
+
+        self.assertTrue(success)
+        source_file.stat.assert_not_called()
+        mock_copy.assert_called_once_with(source_file, dest_file, source_stat)
 
     def test_create_hardlink_cross_device_fallback(self):
         """Test hardlink creation falls back to copy on cross-device error"""
@@ -249,13 +738,7 @@ class TestCrossFilesystemMover(unittest.TestCase):
         source_file = self.source_dir / "source.txt"
         source_file.write_text("content")
 
-        real_mover = CrossFilesystemMover(
-            self.source_dir,
-            self.dest_dir,
-            dry_run=False,
-            quiet=True,
-            dir_manager=DirectoryManager(dry_run=False),
-        )
+        real_mover = self._real_mover()
 
         # Mock os.link to raise cross-device error
         with patch("os.link", side_effect=OSError(18, "Cross-device link")):
@@ -277,13 +760,7 @@ class TestCrossFilesystemMover(unittest.TestCase):
         source_file = self.source_dir / "source.txt"
         source_file.write_text("content")
 
-        real_mover = CrossFilesystemMover(
-            self.source_dir,
-            self.dest_dir,
-            dry_run=False,
-            quiet=True,
-            dir_manager=DirectoryManager(dry_run=False),
-        )
+        real_mover = self._real_mover()
 
         success = real_mover.create_hardlink(primary_file, dest_link, source_file)
 
@@ -299,13 +776,7 @@ class TestCrossFilesystemMover(unittest.TestCase):
         source_file = self.source_dir / "source.txt"
         source_file.write_text("content")
 
-        real_mover = CrossFilesystemMover(
-            self.source_dir,
-            self.dest_dir,
-            dry_run=False,
-            quiet=True,
-            dir_manager=DirectoryManager(dry_run=False),
-        )
+        real_mover = self._real_mover()
 
         # Mock os.link to raise non-cross-device error
         with patch("os.link", side_effect=OSError(13, "Permission denied")):
@@ -348,7 +819,7 @@ class TestCrossFilesystemMover(unittest.TestCase):
         large_dir = self.source_dir / "large"
         large_dir.mkdir()
 
-        with patch("pathlib.Path.rglob", side_effect=PermissionError("Access denied")):
+        with patch("os.scandir", side_effect=PermissionError("Access denied")):
             with self.assertRaises(RuntimeError) as context:
                 CrossFilesystemMover(
                     self.source_dir,
@@ -360,6 +831,19 @@ class TestCrossFilesystemMover(unittest.TestCase):
 
             self.assertIn("Cannot calculate source size", str(context.exception))
 
+    def test_source_scan_sums_regular_files(self):
+        """Test source size sums regular files, symlinks at their copied target size"""
+        (self.source_dir / "nested").mkdir()
+        (self.source_dir / "a.bin").write_bytes(b"x" * 100)
+        (self.source_dir / "nested" / "b.bin").write_bytes(b"y" * 23)
+        os.symlink(self.source_dir / "a.bin", self.source_dir / "link.bin")
+
+        mover = CrossFilesystemMover(
+            self.source_dir, self.dest_dir, dry_run=True, quiet=True
+        )
+
+        self.assertEqual(mover._scan_source_tree().total_size, 223)
+
     def test_cross_scope_hardlink_mapping(self):
         """Test cross-scope hardlink destination mapping"""
         outside_file = self.temp_dir / "outside_scope.txt"
@@ -385,13 +869,8 @@ class TestCrossFilesystemMover(unittest.TestCase):
         link_file = self.source_dir / "link.txt"
         os.link(test_file, link_file)
 
-        real_mover = CrossFilesystemMover(
-            self.source_dir,
-            self.dest_dir,
-            dry_run=False,
-            quiet=True,
-            dir_manager=DirectoryManager(dry_run=False),
-        )
+        real_mover = self._real_mover()
+        real_mover._same_device = False  # Exercise the copy path
 
         # Mock find_hardlinks to return both files
         with patch.object(
@@ -410,8 +889,8 @@ class TestCrossFilesystemMover(unittest.TestCase):
                     temp_files = list(self.dest_dir.glob("*.smartmove_*"))
                     self.assertEqual(len(temp_files), 0)
 
-    def test_hardlink_detection_timeout(self):
-        """Test hardlink detection timeout handling"""
+    def test_hardlink_detection_unreadable_root(self):
+        """Test hardlink detection failure on unreadable scan root"""
         mover = CrossFilesystemMover(
             self.source_dir,
             self.dest_dir,
@@ -420,10 +899,7 @@ class TestCrossFilesystemMover(unittest.TestCase):
             dir_manager=DirectoryManager(),
         )
 
-        # Mock subprocess to timeout
-        with patch(
-            "subprocess.run", side_effect=subprocess.TimeoutExpired(["find"], 300)
-        ):
+        with patch("os.scandir", side_effect=PermissionError("Permission denied")):
             with self.assertRaises(RuntimeError) as context:
                 mover._build_hardlink_index()
 
@@ -471,10 +947,13 @@ class TestCrossFilesystemMover(unittest.TestCase):
             dir_manager=DirectoryManager(dry_run=False),
         )
 
+        # Source owner differs from the process, so chown is attempted
+        real_mover._euid = 4242
+
         # Mock os.geteuid to simulate non-root
         with patch("os.geteuid", return_value=1000):
             with patch(
-                "os.chown", side_effect=PermissionError("Operation not permitted")
+                "os.fchown", side_effect=PermissionError("Operation not permitted")
             ):
                 with self.assertLogs(level="WARNING") as log:
                     result = real_mover.create_file(source_file, dest_file)
@@ -499,24 +978,25 @@ class TestCrossFilesystemMover(unittest.TestCase):
             dir_manager=DirectoryManager(dry_run=False),
         )
 
+        # Source owner differs from the process, so chown is attempted
+        real_mover._euid = 4242
+
         # Mock os.geteuid to simulate root
         with patch("os.geteuid", return_value=0):
             with patch(
-                "os.chown", side_effect=PermissionError("Operation not permitted")
+                "os.fchown", side_effect=PermissionError("Operation not permitted")
             ):
-                with patch("shutil.copy2"):  # Ensure file creation succeeds
-                    with patch("os.chmod"):  # Ensure chmod succeeds
-                        with self.assertLogs(level="WARNING") as log:
-                            result = real_mover.create_file(source_file, dest_file)
-                            self.assertTrue(result)
-
-                            # Check that warning doesn't suggest sudo
-                            warning_msg = log.output[0]
-                            self.assertNotIn("sudo", warning_msg.lower())
-                            self.assertIn("Could not preserve ownership", warning_msg)
-
-    def test_comprehensive_scan_subprocess_error(self):
-        """Test comprehensive scan with subprocess error"""
+                with self.assertLogs(level="WARNING") as log:
+                    result = real_mover.create_file(source_file, dest_file)
+                    self.assertTrue(result)
+
+                    # Check that warning doesn't suggest sudo
+                    warning_msg = log.output[0]
+                    self.assertNotIn("sudo", warning_msg.lower())
+                    self.assertIn("Could not preserve ownership", warning_msg)
+
+    def test_comprehensive_scan_error(self):
+        """Test comprehensive scan with unreadable scan root"""
         mover = CrossFilesystemMover(
             self.source_dir,
             self.dest_dir,
@@ -526,7 +1006,7 @@ class TestCrossFilesystemMover(unittest.TestCase):
             comprehensive_scan=True,
         )
 
-        with patch("subprocess.run", side_effect=OSError("Command not found")):
+        with patch("os.scandir", side_effect=OSError("I/O error")):
             with self.assertRaises(RuntimeError) as context:
                 mover._build_hardlink_index()
 
@@ -551,13 +1031,7 @@ class TestCrossFilesystemMover(unittest.TestCase):
 
     def test_temp_file_cleanup_mechanisms(self):
         """Test temp file cleanup"""
-        mover = CrossFilesystemMover(
-            self.source_dir,
-            self.dest_dir,
-            dry_run=False,
-            quiet=True,
-            dir_manager=DirectoryManager(dry_run=False),
-        )
+        mover = self._real_mover()
 
         temp_file = self.temp_dir / "temp_test.txt"
         temp_file.write_text("temp")
@@ -568,6 +1042,199 @@ class TestCrossFilesystemMover(unittest.TestCase):
         mover._cleanup_temp_files()
         self.assertFalse(temp_file.exists())
 
+    def test_move_directory_precreates_destination_dirs(self):
+        """Test destination directories are created before files are copied"""
+        test_dir = self.source_dir / "tree"
+        (test_dir / "x" / "y").mkdir(parents=True)
+        (test_dir / "top.txt").write_text("top")
+        (test_dir / "x" / "y" / "deep.txt").write_text("deep")
+
+        dir_manager = DirectoryManager(dry_run=False)
+        mover = CrossFilesystemMover(
+            test_dir,
+            self.dest_dir / "tree",
+            dry_run=False,
+            quiet=True,
+            dir_manager=dir_manager,
+        )
+
+        with patch.object(
+            dir_manager, "ensure_directories", wraps=dir_manager.ensure_directories
+        ) as mock_batch:
+            with patch.object(
+                dir_manager, "ensure_directory", wraps=dir_manager.ensure_directory
+            ) as mock_ensure:
+                self.assertTrue(mover.move_directory())
+
+        mock_batch.assert_called_once_with(
+            {str(self.dest_dir / "tree"), str(self.dest_dir / "tree" / "x" / "y")}
+        )
+        # Per-file ensure calls hit the cache filled by the batch
+        self.assertEqual(
+            sorted(call.args[0] for call in mock_ensure.call_args_list),
+            [self.dest_dir / "tree", self.dest_dir / "tree" / "x" / "y"],
+        )
+        self.assertIn(self.dest_dir / "tree" / "x", dir_manager.created_dirs)
+        self.assertEqual(
+            (self.dest_dir / "tree" / "x" / "y" / "deep.txt").read_text(), "deep"
+        )
+
+    def test_single_file_renamed_on_same_device(self):
+        """Test single-link files are renamed when both paths share a device"""
+        mover = self._real_mover()
+        self.assertTrue(mover._same_device)
+        source_file = self.source_dir / "single.txt"
+        source_file.write_text("content")
+        source_ino = source_file.stat().st_ino
+        dest_file = self.dest_dir / "sub" / "single.txt"
+
+        with patch.object(mover, "create_file") as mock_create:
+            self.assertTrue(mover.move_hardlink_group(source_file, dest_file))
+
+        mock_create.assert_not_called()
+        self.assertFalse(source_file.exists())
+        self.assertEqual(dest_file.stat().st_ino, source_ino)
+
+    def test_single_file_copied_when_rename_crosses_devices(self):
+        """Test EXDEV from rename falls back to copy and unlink"""
+        mover = self._real_mover()
+        source_file = self.source_dir / "single.txt"
+        source_file.write_text("content")
+        dest_file = self.dest_dir / "single.txt"
+
+        with patch("os.rename", side_effect=OSError(errno.EXDEV, "Cross-device")):
+            self.assertTrue(mover.move_hardlink_group(source_file, dest_file))
+
+        self.assertFalse(source_file.exists())
+        self.assertEqual(dest_file.read_text(), "content")
+
+    def test_hardlink_group_renamed_on_same_device(self):
+        """Test every link of a group is renamed, keeping the shared inode"""
+        mover = self._real_mover()
+        source_file = self.source_dir / "a.txt"
+        source_file.write_text("content")
+        link_file = self.source_dir / "sub" / "b.txt"
+        link_file.parent.mkdir()
+        os.link(source_file, link_file)
+        source_ino = source_file.stat().st_ino
+
+        with patch.object(mover, "create_file") as mock_create:
+            self.assertTrue(
+                mover.move_hardlink_group(source_file, self.dest_dir / "a.txt")
+            )
+
+        mock_create.assert_not_called()
+        self.assertFalse(source_file.exists())
+        self.assertFalse(link_file.exists())
+        self.assertEqual((self.dest_dir / "a.txt").stat().st_ino, source_ino)
+        self.assertEqual((self.dest_dir / "sub" / "b.txt").stat().st_ino, source_ino)
+
+    def test_hardlink_group_rename_rolls_back_on_exdev(self):
+        """Test a partially renamed group is restored before copying"""
+        mover = self._real_mover()
+        source_file = self.source_dir / "a.txt"
+        source_file.write_text("content")
+        link_file = self.source_dir / "b.txt"
+        os.link(source_file, link_file)
+        real_rename = os.rename
+        calls = []
+
+        def rename(src, dst):
+            calls.append(src)
+            if len(calls) == 2:
+                raise OSError(errno.EXDEV, "Cross-device")
+            real_rename(src, dst)
+
+        with patch("os.rename", side_effect=rename):
+            self.assertFalse(
+                mover._rename_group(
+                    [source_file, link_file], source_file, self.dest_dir / "a.txt"
+                )
+            )
+
+        self.assertTrue(source_file.exists())
+        self.assertTrue(link_file.exists())
+        self.assertFalse((self.dest_dir / "a.txt").exists())
+
+    def test_signal_cleanup_covers_all_movers(self):
+        """Test one process-wide handler cleans temp files of every mover"""
+        from smartmove.core import filesystem
+
+        movers = [
+            CrossFilesystemMover(self.source_dir, self.dest_dir, quiet=True)
+            for _ in range(2)
+        ]
+        temp_files = []
+        for i, mover in enumerate(movers):
+            temp_file = self.dest_dir / f"pending_{i}.smartmove"
+            temp_file.write_text("partial")
+            mover._track_temp_file(temp_file)
+            temp_files.append(temp_file)
+
+        self.assertIs(signal.getsignal(signal.SIGINT), filesystem._cleanup_handler)
+        with self.assertRaises(SystemExit):
+            filesystem._cleanup_handler(signal.SIGTERM, None)
+
+        for temp_file in temp_files:
+            self.assertFalse(temp_file.exists())
+
+    def test_move_directory_skips_existence_probes(self):
+        """Test moved files are not re-stat'ed to detect finished hardlink groups"""
+        test_dir = self.source_dir / "probe"
+        test_dir.mkdir()
+        (test_dir / "single.txt").write_text("single")
+        (test_dir / "a.txt").write_text("linked")
+        os.link(test_dir / "a.txt", test_dir / "b.txt")
+
+        mover = CrossFilesystemMover(
+            test_dir,
+            self.dest_dir / "probe",
+            dry_run=False,
+            quiet=True,
+            dir_manager=DirectoryManager(dry_run=False),
+        )
+        mover._same_device = False
+
+        with patch.object(Path, "exists", autospec=True) as mock_exists:
+            mock_exists.return_value = True
+            with self.assertLogs(level="INFO") as log:
+                self.assertTrue(mover.move_directory())
+
+        probed = {call.args[0] for call in mock_exists.call_args_list}
+        sources = {test_dir / name for name in ("single.txt", "a.txt", "b.txt")}
+        self.assertFalse(probed & sources)
+        self.assertIn("2 files, 1 hardlink groups", log.output[-1])
+        moved = self.dest_dir / "probe"
+        self.assertEqual(
+            (moved / "a.txt").stat().st_ino, (moved / "b.txt").stat().st_ino
+        )
+
+    def test_hardlink_group_untracks_temp_files_after_rename(self):
+        """Test renamed hardlink temp files are no longer tracked for cleanup"""
+        test_dir = self.source_dir / "group_dir"
+        test_dir.mkdir()
+        primary = test_dir / "a.txt"
+        primary.write_text("shared")
+        os.link(primary, test_dir / "b.txt")
+
+        mover = CrossFilesystemMover(
+            test_dir,
+            self.dest_dir / "group_dir",
+            dry_run=False,
+            quiet=True,
+            dir_manager=DirectoryManager(dry_run=False),
+        )
+        mover.source_root = test_dir
+
+        self.assertTrue(
+            mover.move_hardlink_group(primary, self.dest_dir / "group_dir" / "a.txt")
+        )
+
+        self.assertEqual(mover.temp_files, set())
+        moved_a = self.dest_dir / "group_dir" / "a.txt"
+        moved_b = self.dest_dir / "group_dir" / "b.txt"
+        self.assertEqual(moved_a.stat().st_ino, moved_b.stat().st_ino)
+
     def test_move_directory_cross_filesystem(self):
         """Test move_directory method directly"""
         test_dir = self.source_dir / "test_dir"
@@ -583,14 +1250,44 @@ class TestCrossFilesystemMover(unittest.TestCase):
         )
 
         with patch.object(real_mover, "_find_mount_point", return_value=self.temp_dir):
-            with patch("subprocess.run") as mock_run:
-                mock_run.return_value.returncode = 0
-                mock_run.return_value.stdout = ""
-
-                success = real_mover.move_directory()
+            success = real_mover.move_directory()
 
         self.assertTrue(success)
 
+    def test_move_directory_parallel_preserves_hardlinks(self):
+        """Test threaded directory move keeps hardlink groups intact"""
+        test_dir = self.source_dir / "parallel_dir"
+        for i in range(4):
+            (test_dir / f"dir_{i}").mkdir(parents=True)
+            (test_dir / f"dir_{i}" / "plain.txt").write_text(f"plain {i}")
+        shared = test_dir / "dir_0" / "shared.txt"
+        shared.write_text("shared")
+        for i in range(1, 4):
+            os.link(shared, test_dir / f"dir_{i}" / "shared_link.txt")
+
+        dest = self.dest_dir / "parallel_moved"
+        real_mover = CrossFilesystemMover(
+            test_dir,
+            dest,
+            dry_run=False,
+            quiet=True,
+            dir_manager=DirectoryManager(dry_run=False),
+            move_threads=4,
+        )
+        real_mover.source_root = self.temp_dir
+
+        self.assertTrue(real_mover.move_directory())
+        self.assertFalse(test_dir.exists())
+
+        moved_shared = dest / "dir_0" / "shared.txt"
+        self.assertEqual(moved_shared.stat().st_nlink, 4)
+        for i in range(1, 4):
+            moved_link = dest / f"dir_{i}" / "shared_link.txt"
+            self.assertEqual(moved_link.stat().st_ino, moved_shared.stat().st_ino)
+            self.assertEqual(
+                (dest / f"dir_{i}" / "plain.txt").read_text(), f"plain {i}"
+            )
+
     def test_progress_reporter_unicode_detection_success(self):
         """Test Unicode detection with all conditions met"""
 
@@ -673,57 +1370,356 @@ class TestCrossFilesystemMover(unittest.TestCase):
 
             self.assertEqual(captured_output.getvalue(), "")
 
-    def test_get_total_file_count_single_file(self):
-        """Test _get_total_file_count with single file"""
-        source_file = self.temp_dir / "single.txt"
-        source_file.write_text("content")
+    def test_scan_source_tree_collects_stats(self):
+        """Test _scan_source_tree enumerates files with cached stats"""
+        test_dir = self.temp_dir / "scan_dir"
+        (test_dir / "nested").mkdir(parents=True)
+        (test_dir / "a.txt").write_text("a")
+        (test_dir / "nested" / "b.txt").write_text("b")
+        os.symlink("missing.txt", test_dir / "broken.txt")
+        (self.temp_dir / "target.txt").write_text("xyz")
+        os.symlink(self.temp_dir / "target.txt", test_dir / "linked.txt")
 
         mover = CrossFilesystemMover(
-            source_file,
-            self.temp_dir / "dest.txt",
-            dry_run=True,
+            test_dir, self.temp_dir / "dest", dry_run=True, quiet=True, dir_manager=None
+        )
+
+        scan = mover._scan_source_tree()
+        found = {
+            os.path.basename(path): file_stat for path, file_stat in scan.work_items
+        }
+
+        self.assertEqual(set(found), {"a.txt", "b.txt", "linked.txt"})
+        self.assertEqual(found["a.txt"].st_ino, (test_dir / "a.txt").stat().st_ino)
+        self.assertEqual(
+            found["b.txt"].st_ino, (test_dir / "nested" / "b.txt").stat().st_ino
+        )
+        self.assertEqual(
+            sorted(scan.directories), [str(test_dir), str(test_dir / "nested")]
+        )
+        # The symlinked file is copied by content, so its target size counts
+        self.assertEqual(scan.total_size, 5)
+        self.assertFalse(scan.saw_multilink)
+
+    def test_dest_for_maps_scanned_paths(self):
+        """Test scanned source path strings map onto the destination tree"""
+        mover = CrossFilesystemMover(
+            self.source_dir, self.dest_dir, dry_run=True, quiet=True
+        )
+        nested = os.path.join(str(self.source_dir), "a", "b.txt")
+
+        self.assertEqual(
+            mover._dest_for(nested), os.path.join(str(self.dest_dir), "a", "b.txt")
+        )
+        self.assertEqual(mover._dest_for(str(self.source_dir)), str(self.dest_dir))
+
+    def test_source_tree_scanned_once(self):
+        """Test space validation and the directory move share one tree walk"""
+        test_dir = self.temp_dir / "scan_once"
+        test_dir.mkdir()
+        (test_dir / "a.txt").write_text("a")
+
+        from smartmove.core.filesystem import _parallel_scandir
+
+        with patch(
+            "smartmove.core.filesystem._parallel_scandir", wraps=_parallel_scandir
+        ) as mock_walk:
+            mover = CrossFilesystemMover(
+                test_dir,
+                self.temp_dir / "dest_once",
+                dry_run=True,
+                quiet=True,
+                dir_manager=DirectoryManager(dry_run=True),
+            )
+            self.assertTrue(mover.move_directory())
+
+        mock_walk.assert_called_once()
+
+    def test_parallel_scandir_reraises_visit_errors(self):
+        """Test unexpected visit errors end the walk instead of hanging it"""
+        from smartmove.core.filesystem import _parallel_scandir
+
+        tree = self.temp_dir / "walk"
+        for i in range(4):
+            (tree / f"dir_{i}" / "nested").mkdir(parents=True)
+
+        def visit(directory, entry):
+            if entry.name == "nested":
+                raise KeyError(entry.name)
+            return entry.is_dir()
+
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                with self.assertRaises(KeyError):
+                    _parallel_scandir(str(tree), visit, workers)
+
+    def test_remove_empty_dirs_prunes_bottom_up(self):
+        """Test empty directory trees are removed while non-empty ones remain"""
+        test_dir = self.temp_dir / "prune_dir"
+        (test_dir / "empty" / "deeper").mkdir(parents=True)
+        (test_dir / "kept").mkdir()
+        (test_dir / "kept" / "file.txt").write_text("content")
+
+        mover = CrossFilesystemMover(
+            test_dir,
+            self.temp_dir / "dest",
+            dry_run=False,
             quiet=True,
             dir_manager=None,
         )
+        mover._remove_empty_dirs()
 
-        count = mover._get_total_file_count()
-        self.assertEqual(count, 1)
+        self.assertFalse((test_dir / "empty").exists())
+        self.assertTrue((test_dir / "kept" / "file.txt").exists())
 
-    def test_get_total_file_count_directory(self):
-        """Test _get_total_file_count with directory"""
-        test_dir = self.temp_dir / "test_dir"
-        test_dir.mkdir()
+        (test_dir / "kept" / "file.txt").unlink()
+        mover._remove_empty_dirs()
+        self.assertFalse(test_dir.exists())
 
-        # Create test files
-        for i in range(5):
+    def test_move_directory_skips_index_without_hardlinks(self):
+        """Test hardlink index is never built for single-link trees"""
+        test_dir = self.temp_dir / "plain_dir"
+        test_dir.mkdir()
+        for i in range(3):
             (test_dir / f"file_{i}.txt").write_text(f"content {i}")
 
         mover = CrossFilesystemMover(
             test_dir,
-            self.temp_dir / "dest_dir",
+            self.temp_dir / "dest_plain",
             dry_run=True,
             quiet=True,
-            dir_manager=None,
+            dir_manager=DirectoryManager(dry_run=True),
         )
 
-        count = mover._get_total_file_count()
-        self.assertEqual(count, 5)
+        with patch.object(mover, "_build_hardlink_index") as mock_build:
+            self.assertTrue(mover.move_directory())
+            mock_build.assert_not_called()
 
-    def test_get_total_file_count_subprocess_fallback(self):
-        """Test _get_total_file_count fallback on subprocess failure"""
-        test_dir = self.temp_dir / "fallback_test"
+    def test_move_directory_builds_index_once_for_hardlinks(self):
+        """Test hardlink index is built up front when multi-link files exist"""
+        test_dir = self.temp_dir / "linked_dir"
         test_dir.mkdir()
         (test_dir / "file.txt").write_text("content")
+        os.link(test_dir / "file.txt", test_dir / "link.txt")
 
         mover = CrossFilesystemMover(
-            test_dir, self.temp_dir / "dest", dry_run=True, quiet=True, dir_manager=None
+            test_dir,
+            self.temp_dir / "dest_linked",
+            dry_run=True,
+            quiet=True,
+            dir_manager=DirectoryManager(dry_run=True),
         )
 
-        with patch(
-            "subprocess.run", side_effect=subprocess.CalledProcessError(1, "find")
+        with patch.object(
+            mover, "_build_hardlink_index", wraps=mover._build_hardlink_index
+        ) as mock_build:
+            with patch.object(mover, "_build_hardlink_index_parallel") as mock_scan:
+                self.assertTrue(mover.move_directory())
+        mock_build.assert_called_once()
+        # Both links live inside the source, so the mount is never scanned
+        mock_scan.assert_not_called()
+
+    def test_scoped_index_scans_mount_only_for_outside_links(self):
+        """Test the mount scan is limited to inodes with links outside the source"""
+        inside = self.source_dir / "inside.txt"
+        inside.write_text("inside")
+        os.link(inside, self.source_dir / "inside_link.txt")
+        shared = self.source_dir / "shared.txt"
+        shared.write_text("shared")
+        os.link(shared, self.temp_dir / "outside_link.txt")
+
+        self.mover.source_root = self.temp_dir
+        with patch.object(
+            self.mover,
+            "_build_hardlink_index_parallel",
+            wraps=self.mover._build_hardlink_index_parallel,
+        ) as mock_scan:
+            self.mover._build_hardlink_index()
+
+        mock_scan.assert_called_once_with(inodes={shared.stat().st_ino: 2})
+        index = self.mover.hardlink_index
+        self.assertEqual(len(index[inside.stat().st_ino]), 2)
+        self.assertEqual(
+            set(index[shared.stat().st_ino]),
+            {shared, self.temp_dir / "outside_link.txt"},
+        )
+
+    def test_targeted_scan_stops_when_all_links_found(self):
+        """Test the targeted mount walk ends once every link is accounted for"""
+        mount = self.temp_dir / "mount"
+        mount.mkdir()
+        linked = mount / "file.txt"
+        linked.write_text("content")
+        os.link(linked, mount / "link.txt")
+        for i in range(20):
+            (mount / f"dir_{i}").mkdir()
+
+        inode = linked.stat().st_ino
+        with patch("os.scandir", wraps=os.scandir) as mock_scandir:
+            found = list(
+                self.mover._scan_multilink_files(str(mount), inodes={inode: 2})
+            )
+
+        self.assertEqual(
+            {path for _, path, _ in found}, {str(linked), str(mount / "link.txt")}
+        )
+        # Both links sit in the root, so no subdirectory is ever opened
+        self.assertEqual(mock_scandir.call_count, 1)
+
+    def test_targeted_scan_tolerates_extra_sightings(self):
+        """Test an inode seen more often than its link count ends the walk cleanly"""
+        mount = self.temp_dir / "mount"
+        (mount / "sub").mkdir(parents=True)
+        linked = mount / "file.txt"
+        linked.write_text("content")
+        os.link(linked, mount / "link.txt")
+        other = mount / "sub" / "other.txt"
+        other.write_text("other")
+        os.link(other, mount / "sub" / "other_link.txt")
+        # Counts of one stand in for an inode a bind mount shows twice
+        inodes = {linked.stat().st_ino: 1, other.stat().st_ino: 1}
+
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                found = list(
+                    self.mover._scan_multilink_files(
+                        str(mount), inodes=inodes, workers=workers
+                    )
+                )
+                self.assertEqual({inode for inode, _, _ in found}, set(inodes))
+                self.assertEqual(len(found), 2)
+
+    def test_multilink_scan_skips_entries_removed_mid_walk(self):
+        """Test a file vanishing during the scan drops only that entry"""
+        mount = self.temp_dir / "mount"
+        mount.mkdir()
+        for i in range(10):
+            linked = mount / f"file_{i}.txt"
+            linked.write_text("content")
+            os.link(linked, mount / f"link_{i}.txt")
+        (mount / "gone.txt").write_text("gone")
+
+        class VanishingEntry:
+            """DirEntry whose file was removed after readdir returned it"""
+
+            def __init__(self, entry):
+                self._entry = entry
+                self.name = entry.name
+
+            def is_dir(self, follow_symlinks=True):
+                return False
+
+            def is_file(self, follow_symlinks=True):
+                return True
+
+            def stat(self, follow_symlinks=True):
+                raise FileNotFoundError(self.name)
+
+        real_scandir = os.scandir
+
+        class ScandirWithVanishing:
+            def __init__(self, fd):
+                self._it = real_scandir(fd)
+
+            def __enter__(self):
+                entries = sorted(self._it, key=lambda e: e.name != "gone.txt")
+                return [
+                    VanishingEntry(e) if e.name == "gone.txt" else e for e in entries
+                ]
+
+            def __exit__(self, *exc):
+                self._it.close()
+
+        with patch("os.scandir", ScandirWithVanishing):
+            found = list(self.mover._scan_multilink_files(str(mount), workers=1))
+
+        self.assertEqual(len(found), 20)
+
+    def test_scoped_index_keeps_source_links(self):
+        """Test source-side links survive a mount scan that did not report them"""
+        shared = self.source_dir / "shared.txt"
+        shared.write_text("shared")
+        outside = self.temp_dir / "outside_link.txt"
+        os.link(shared, outside)
+        inode = shared.stat().st_ino
+
+        self.mover.source_root = self.temp_dir
+        with patch.object(
+            self.mover,
+            "_build_hardlink_index_parallel",
+            return_value=HardlinkIndex([(inode, str(outside)), (inode, str(shared))]),
+        ):
+            self.mover._build_hardlink_index()
+        self.assertEqual(set(self.mover.hardlink_index[inode]), {shared, outside})
+
+        self.mover.hardlink_index = None
+        with patch.object(
+            self.mover,
+            "_build_hardlink_index_parallel",
+            return_value=HardlinkIndex([(inode, str(outside))]),
         ):
-            count = mover._get_total_file_count()
-            self.assertEqual(count, 1)  # Should fall back to rglob
+            self.mover._build_hardlink_index()
+        self.assertEqual(set(self.mover.hardlink_index[inode]), {shared, outside})
+
+    def test_index_cache_reused_when_valid(self):
+        """Test cached outside links are reused and stale groups force a rescan"""
+        source_file = self.source_dir / "file.txt"
+        source_file.write_text("content")
+        outside_link = self.temp_dir / "outside.txt"
+        os.link(source_file, outside_link)
+        cache_home = self.temp_dir / "cache"
+
+        def build_index():
+            mover = CrossFilesystemMover(
+                self.source_dir, self.dest_dir, quiet=True, index_cache=True
+            )
+            mover.source_root = self.temp_dir
+            with patch.object(
+                mover,
+                "_build_hardlink_index_parallel",
+                wraps=mover._build_hardlink_index_parallel,
+            ) as mock_scan:
+                mover._build_hardlink_index()
+            return mover.hardlink_index, mock_scan.call_count
+
+        inode = source_file.stat().st_ino
+        with patch.dict(os.environ, {"XDG_CACHE_HOME": str(cache_home)}):
+            index, scans = build_index()
+            self.assertEqual(scans, 1)
+            self.assertEqual(set(index[inode]), {source_file, outside_link})
+
+            index, scans = build_index()
+            self.assertEqual(scans, 0)
+            self.assertEqual(set(index[inode]), {source_file, outside_link})
+
+            # A new link makes the cached group incomplete
+            second_link = self.temp_dir / "second.txt"
+            os.link(source_file, second_link)
+            index, scans = build_index()
+            self.assertEqual(scans, 1)
+            self.assertEqual(
+                set(index[inode]), {source_file, outside_link, second_link}
+            )
+
+    def test_scoped_index_for_single_file_source(self):
+        """Test a single-file source finds its links through a targeted scan"""
+        source_file = self.source_dir / "file.txt"
+        source_file.write_text("content")
+        os.link(source_file, self.temp_dir / "elsewhere.txt")
+        (self.source_dir / "unrelated.txt").write_text("x")
+        os.link(self.source_dir / "unrelated.txt", self.temp_dir / "unrelated_link")
+
+        mover = CrossFilesystemMover(
+            source_file, self.dest_dir / "file.txt", dry_run=True, quiet=True
+        )
+        mover.source_root = self.temp_dir
+        mover._build_hardlink_index()
+
+        self.assertEqual(list(mover.hardlink_index), [source_file.stat().st_ino])
+        self.assertEqual(
+            set(mover.hardlink_index[source_file.stat().st_ino]),
+            {source_file, self.temp_dir / "elsewhere.txt"},
+        )
 
     def test_progress_reporter_unicode_detection_exception(self):
         """Test Unicode detection exception handling"""
@@ -774,6 +1770,21 @@ class TestCrossFilesystemMover(unittest.TestCase):
         output = captured_output.getvalue()
         self.assertIn("=", output)  # ASCII progress bar
 
+    def test_progress_reporter_throttles_redraws(self):
+        """Test redraws are rate limited but completion always renders"""
+        progress = ProgressReporter(100, show_progress=True)
+        progress.unicode_support = False
+
+        captured_output = io.StringIO()
+        with redirect_stdout(captured_output):
+            for _ in range(100):
+                progress.update()
+
+        output = captured_output.getvalue()
+        self.assertLess(output.count("\r"), 10)
+        self.assertIn("[====================] 100%", output)
+        self.assertTrue(output.endswith("\n"))
+
 
 class TestFilesystemDetection(unittest.TestCase):
     """Test filesystem detection logic"""
@@ -842,7 +1853,7 @@ class TestPerformanceOptimizations(unittest.TestCase):
     """Test performance optimizations"""
 
     def test_memory_index_vs_repeated_find(self):
-        """Test that memory index avoids repeated subprocess calls"""
+        """Test that memory index avoids repeated filesystem scans"""
         temp_dir = Path(tempfile.mkdtemp())
         try:
             # Create source and dest directories first
@@ -853,11 +1864,12 @@ class TestPerformanceOptimizations(unittest.TestCase):
 
             mover = CrossFilesystemMover(source_dir, dest_dir, dry_run=True, quiet=True)
 
-            # Mock subprocess to count calls
-            with patch("subprocess.run") as mock_run:
-                mock_run.return_value.returncode = 0
-                mock_run.return_value.stdout = "12345 /path/file.txt\n"
-
+            # Mock the scan to count calls
+            with patch.object(
+                mover,
+                "_build_hardlink_index_parallel",
+                return_value=HardlinkIndex([(12345, "/path/file.txt")]),
+            ) as mock_scan:
                 # Create mock file with hardlinks
                 mock_file = MagicMock()
                 mock_file.stat.return_value.st_nlink = 2
@@ -865,17 +1877,17 @@ class TestPerformanceOptimizations(unittest.TestCase):
 
                 # First call should build index
                 mover.find_hardlinks(mock_file)
-                first_call_count = mock_run.call_count
+                first_call_count = mock_scan.call_count
 
                 # Second call should use cached index
                 mover.find_hardlinks(mock_file)
-                second_call_count = mock_run.call_count
+                second_call_count = mock_scan.call_count
 
-                # Should not make additional subprocess calls
+                # Should not rescan the filesystem
                 self.assertEqual(
                     first_call_count,
                     second_call_count,
-                    "Second call should use cached index, not make new subprocess call",
+                    "Second call should use cached index, not rescan the filesystem",
                 )
         finally:
             shutil.rmtree(temp_dir, ignore_errors=True)